@@ -12,12 +12,20 @@ import json
 import sympy as sp
 from sympy import symbols, simplify
 from flask import Blueprint, request, jsonify
-from backend.integral_solver import solve_integral
-from backend.parametric_solver import solve_parametric
+from backend.integral_solver import solve_integral, safe_parse_expr
+from backend.parametric_solver import solve_parametric, solve_parametric_definite, DEFINITE_QUANTITIES
 from backend.polar_solver import solve_polar
+from backend.expression_guard import GUARD_LIMITS, inline_safe
+from backend.solver_worker import SolverWorkerError, WORKER_LIMITS
+from backend import metrics
+from backend import strategy_stats
+from backend import solution_table
+from backend import polar_cache
+from backend import practice_catalog
+from backend.plot_data import plot_data, encode_payload, DEFAULT_PIXELS
+from backend.single_flight import run_shared_solver_task
 from flask_mail import Mail, Message
 
-import sqlite3
 from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
 
 solver_bp = Blueprint("solver", __name__)
@@ -36,7 +44,7 @@ CORS(app, origins=[
     'http://localhost:5000'
 ], supports_credentials=True)
 
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///eulearn.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or 'sqlite:///eulearn.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['MAIL_SERVER'] = 'smtp.gmail.com'
@@ -156,9 +164,23 @@ def create_tables():
         print("Database tables created!")
 
 create_tables()
+practice_catalog.load()
 
 import sympy as sp
 
+def sympify_for_display(text):
+    """
+    Evaluated SymPy form of an expression string for display. The string is
+    parsed unevaluated first, and anything the expression guard wouldn't run
+    in the request process (e.g. x^2*2^(2^32)) raises ValueError instead of
+    being evaluated.
+    """
+    expr = sp.sympify(text, evaluate=False)
+    symbols = sorted(expr.free_symbols, key=str)
+    if not inline_safe(expr, symbols[0] if symbols else sp.Symbol('x')):
+        raise ValueError("Expression too large to format in the request process")
+    return sp.sympify(text)
+
 def format_latex_expression(expr):
     """
     Convert a SymPy expression or math-like string to LaTeX for KaTeX,
@@ -176,7 +198,7 @@ def format_latex_expression(expr):
                 expr_without_c = expr.replace('+ C', '').strip()
                 try:
                     temp_expr = expr_without_c.replace('\\theta', 'theta')
-                    sym_expr = sp.sympify(temp_expr)
+                    sym_expr = sympify_for_display(temp_expr)
                     latex_str = sp.latex(sym_expr)
                     latex_str = latex_str.replace('theta', '\\theta')
                     return f"$${latex_str} + C$$"
@@ -185,7 +207,7 @@ def format_latex_expression(expr):
             else:
                 try:
                     temp_expr = expr.replace('\\theta', 'theta')
-                    sym_expr = sp.sympify(temp_expr)
+                    sym_expr = sympify_for_display(temp_expr)
                     latex_str = sp.latex(sym_expr)
                     latex_str = latex_str.replace('theta', '\\theta')
                     return f"$${latex_str}$$"
@@ -210,8 +232,8 @@ def format_input_for_display(input_str, solver_type):
                     y_part = parts[1].split('=')[1].strip() if '=' in parts[1] else parts[1].strip()
                     
                     try:
-                        x_expr = sp.sympify(x_part.replace('theta', 'theta_sym'))
-                        y_expr = sp.sympify(y_part.replace('theta', 'theta_sym'))
+                        x_expr = sympify_for_display(x_part.replace('theta', 'theta_sym'))
+                        y_expr = sympify_for_display(y_part.replace('theta', 'theta_sym'))
                         x_latex = sp.latex(x_expr).replace('theta\\_sym', '\\theta')
                         y_latex = sp.latex(y_expr).replace('theta\\_sym', '\\theta')
                         return f"$$x(t) = {x_latex}, \\quad y(t) = {y_latex}$$"
@@ -231,8 +253,8 @@ def format_input_for_display(input_str, solver_type):
                     outer_part = parts[1].replace('Outer:', '').strip()
                     
                     try:
-                        inner_expr = sp.sympify(inner_part.replace('theta', 'theta_sym'))
-                        outer_expr = sp.sympify(outer_part.replace('theta', 'theta_sym'))
+                        inner_expr = sympify_for_display(inner_part.replace('theta', 'theta_sym'))
+                        outer_expr = sympify_for_display(outer_part.replace('theta', 'theta_sym'))
                         inner_latex = sp.latex(inner_expr).replace('theta\\_sym', '\\theta').replace('\\_sym', '')
                         outer_latex = sp.latex(outer_expr).replace('theta\\_sym', '\\theta').replace('\\_sym', '')
                         return f"$$\\text{{Inner: }} r_1(\\theta) = {inner_latex}, \\quad \\text{{Outer: }} r_2(\\theta) = {outer_latex}$$"
@@ -245,7 +267,7 @@ def format_input_for_display(input_str, solver_type):
                 if '=' in input_str:
                     expr_part = input_str.split('=')[1].strip()
                     try:
-                        expr = sp.sympify(expr_part.replace('theta', 'theta_sym').replace('θ', 'theta_sym'))
+                        expr = sympify_for_display(expr_part.replace('theta', 'theta_sym').replace('θ', 'theta_sym'))
                         expr_latex = sp.latex(expr).replace('theta\\_sym', '\\theta').replace('\\_sym', '')
                         return f"$$r(\\theta) = {expr_latex}$$"
                     except:
@@ -257,7 +279,7 @@ def format_input_for_display(input_str, solver_type):
         else:
             input_clean = input_str.replace('theta', '\\theta').replace('θ', '\\theta')
             try:
-                expr = sp.sympify(input_clean.replace('\\theta', 'theta'))
+                expr = sympify_for_display(input_clean.replace('\\theta', 'theta'))
                 expr_latex = sp.latex(expr).replace('theta', '\\theta')
                 return f"$$\\int {expr_latex} \\, dx$$"
             except:
@@ -343,57 +365,6 @@ def compare_math_expressions(user_expr, correct_expr, variable='x'):
         print(f"Expression comparison error: {e}")
         return normalize_math_expression(user_expr) == normalize_math_expression(correct_expr)
 
-def format_bound_for_display(bound):
-    """Helper function to format a single bound in terms of π"""
-    import math
-    
-    if bound == 0:
-        return "0"
-    
-    pi_multiple = bound / math.pi
-    tolerance = 1e-10
-    
-    if abs(pi_multiple - round(pi_multiple)) < tolerance:
-        multiple = int(round(pi_multiple))
-        if multiple == 1:
-            return "π"
-        elif multiple == -1:
-            return "-π"
-        else:
-            return f"{multiple}π"
-    
-    half_multiple = pi_multiple * 2
-    if abs(half_multiple - round(half_multiple)) < tolerance:
-        numerator = int(round(half_multiple))
-        if numerator == 1:
-            return "π/2"
-        elif numerator == -1:
-            return "-π/2"
-        else:
-            return f"{numerator}π/2"
-    
-    third_multiple = pi_multiple * 3
-    if abs(third_multiple - round(third_multiple)) < tolerance:
-        numerator = int(round(third_multiple))
-        if numerator == 1:
-            return "π/3"
-        elif numerator == -1:
-            return "-π/3"
-        else:
-            return f"{numerator}π/3"
-    
-    fourth_multiple = pi_multiple * 4
-    if abs(fourth_multiple - round(fourth_multiple)) < tolerance:
-        numerator = int(round(fourth_multiple))
-        if numerator == 1:
-            return "π/4"
-        elif numerator == -1:
-            return "-π/4"
-        else:
-            return f"{numerator}π/4"
-    
-    return f"{bound:.4f}"
-
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -406,6 +377,19 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+def problem_response(kind, catalog, problem_id, progress):
+    """{"problem": ...} response from the catalog's serialized problem and the user's progress on it"""
+    body = '{"problem": ' + practice_catalog.problem_json(catalog.fragment(kind, problem_id), progress) + '}'
+    return app.response_class(body, mimetype='application/json')
+
+def evaluate_polar_input(expr, theta):
+    """
+    Evaluate a polar input parsed with evaluate=False, unless the expression
+    guard says it is too large for the request process (e.g. theta*2**(2**32));
+    then it stays unevaluated and only the solver worker evaluates it.
+    """
+    return expr.doit() if inline_safe(expr, theta) else expr
+
 def clean_polar_expression(expr_str):
     """Clean polar expression from various input formats"""
     expr_str = str(expr_str).strip()
@@ -428,6 +412,47 @@ def clean_polar_expression(expr_str):
     
     return expr_str
 
+def polar_answer_value(answer):
+    """Numeric value of a polar area answer, given as a decimal or an exact expression like 3*pi/2"""
+    try:
+        return float(answer)
+    except ValueError:
+        pass
+    expr, error = safe_parse_expr(str(answer).replace('π', 'pi'))
+    if error or expr.free_symbols:
+        raise ValueError(f"Could not read answer '{answer}'")
+    return float(expr.evalf())
+
+MAX_SECTOR_STEPS = 12
+
+def polar_angle_latex(angle):
+    """LaTeX for an angle as a rational multiple of π where possible"""
+    return sp.latex(sp.nsimplify(angle / float(sp.pi), tolerance=1e-6, rational=True) * sp.pi)
+
+def polar_symmetry_step(details):
+    """Describe the symmetry solve_polar used to shrink the integration range"""
+    start, end = (polar_angle_latex(details[key]) for key in ('theta_start', 'theta_end'))
+    return (f"The region is symmetric, so we integrated over $$\\theta \\in [{start}, {end}]$$ "
+            f"and multiplied by {details['symmetry_factor']}.")
+
+def polar_sector_steps(details):
+    """One step per sector where the inner curve is outside the outer one, with its area"""
+    contributing = [sector for sector in details.get('sectors', []) if sector['outer'] == 'inner']
+    steps = [
+        f"Sector $$\\theta \\in [{polar_angle_latex(sector['start'])}, {polar_angle_latex(sector['end'])}]$$: "
+        f"area {sector['area']:.6f}"
+        for sector in contributing[:MAX_SECTOR_STEPS]
+    ]
+    if len(contributing) > MAX_SECTOR_STEPS:
+        rest = sum(sector['area'] for sector in contributing[MAX_SECTOR_STEPS:])
+        steps.append(f"{len(contributing) - MAX_SECTOR_STEPS} more sectors: area {rest:.6f}")
+    return steps
+
+def polar_budget_step(details):
+    """Explain a polar result computed with reduced precision after running out of time"""
+    return (f"The time limit was reached during {', '.join(details['overruns'])}, so a faster method was used. "
+            f"Estimated error of the result: {details.get('error_estimate', 0.0):.1e}")
+
 def clean_single_polar_expression(expr_str):
     """Clean single polar expression"""
     expr_str = str(expr_str).strip()
@@ -613,6 +638,12 @@ def get_user_stats(current_user):
     except Exception as e:
         return jsonify({'error': 'Failed to load stats', 'details': str(e)}), 500
 
+def load_integral_history():
+    """(input, steps) pairs of recent integral solves, used to learn strategy order"""
+    return db.session.query(SolvedProblem.input, SolvedProblem.steps).filter(
+        SolvedProblem.solver_type == 'integral'
+    ).order_by(SolvedProblem.created_at.desc()).limit(strategy_stats.HISTORY_LIMIT).all()
+
 @app.route('/api/solver/solve', methods=['POST'])
 @token_required
 def solve_integral_api(current_user):
@@ -627,12 +658,22 @@ def solve_integral_api(current_user):
 
     solution = None
     steps = []
+    sectors = None
     
     if solver_type == "integral":
+        strategy_stats.refresh_if_due(load_integral_history)
         try:
-            solution, steps = solve_integral(integral, "x")
+            precomputed = solution_table.lookup('integral', integral)
+            if precomputed:
+                solution, steps = precomputed['solution'], precomputed['steps']
+            else:
+                solution, steps = run_shared_solver_task('integral', (integral,), solve_integral, integral, "x",
+                                                          name='integral')
             if solution and '+ C' not in str(solution):
                 solution = f"{solution} + C"
+        except SolverWorkerError as e:
+            app.logger.error(f'Integral solver worker error: {str(e)}')
+            return jsonify({'error': e.user_message()}), 400
         except Exception as e:
             app.logger.error(f'Integral solver error: {str(e)}')
             return jsonify({'error': f'Integral solver error: {str(e)}'}), 400
@@ -651,10 +692,32 @@ def solve_integral_api(current_user):
         if not xt or not yt:
             return jsonify({'error': 'Both parametric functions must be provided and non-empty'}), 400
         
+        definite = data.get('mode') == 'definite'
+        if definite:
+            quantity = data.get('quantity', 'area')
+            lower, upper = str(data.get('lower', '')).strip(), str(data.get('upper', '')).strip()
+            if quantity not in DEFINITE_QUANTITIES:
+                return jsonify({'error': f'Unknown quantity: {quantity}. Use: {", ".join(DEFINITE_QUANTITIES)}'}), 400
+            if not lower or not upper:
+                return jsonify({'error': 'Definite parametric integrals need lower and upper bounds for t'}), 400
+        
         try:
-            solution, steps = solve_parametric(xt, yt, "t")
-            if solution and '+ C' not in str(solution):
+            if definite:
+                solution, steps = run_shared_solver_task('parametric', (xt, yt, lower, upper), solve_parametric_definite,
+                                                          xt, yt, "t", lower, upper, quantity,
+                                                          name='parametric_definite', variant=quantity)
+            else:
+                precomputed = solution_table.lookup('parametric', xt, yt)
+                if precomputed:
+                    solution, steps = precomputed['solution'], precomputed['steps']
+                else:
+                    solution, steps = run_shared_solver_task('parametric', (xt, yt), solve_parametric, xt, yt, "t",
+                                                              name='parametric')
+            if solution and not definite and '+ C' not in str(solution):
                 solution = f"{solution} + C"
+        except SolverWorkerError as e:
+            app.logger.error(f'Parametric solver worker error: {str(e)}')
+            return jsonify({'error': e.user_message()}), 400
         except Exception as e:
             app.logger.error(f'Parametric solver error: {str(e)}')
             return jsonify({'error': f'Parametric solver error: {str(e)}'}), 400
@@ -685,8 +748,8 @@ def solve_integral_api(current_user):
                 
                 theta = sp.Symbol('theta')
                 try:
-                    r1_expr = sp.sympify(r1_str)
-                    r2_expr = sp.sympify(r2_str)
+                    r1_expr = sp.sympify(r1_str, evaluate=False)
+                    r2_expr = sp.sympify(r2_str, evaluate=False)
                 except Exception as parse_e:
                     return jsonify({'error': f'Invalid mathematical expressions in polar functions: {str(parse_e)}'}), 400
                 
@@ -698,14 +761,36 @@ def solve_integral_api(current_user):
                 if r2_vars and theta not in r2_vars:
                     return jsonify({'error': f'Second polar function contains unknown variables: {r2_vars}. Use "theta" as the variable.'}), 400
                 
-                area = solve_polar(r2_expr, r1_expr, theta)
-                solution = f"$$\\text{{Result: {area:.6f}}}$$"
+                r1_expr = evaluate_polar_input(r1_expr, theta)
+                r2_expr = evaluate_polar_input(r2_expr, theta)
+                
+                precomputed = solution_table.lookup('polar', r1_expr, r2_expr)
+                if precomputed:
+                    area, details = precomputed['area'], precomputed.get('details', {})
+                else:
+                    area, details = polar_cache.solve_cached(
+                        lambda: run_shared_solver_task('polar', (r1_expr, r2_expr), solve_polar, r2_expr, r1_expr,
+                                                       theta, exact=True, return_details=True, name='polar'),
+                        r2_expr, r1_expr, theta, exact=True)
+                if details.get('exact') is not None:
+                    solution = f"$$\\text{{Result: }} {sp.latex(details['exact'])} \\approx {area:.6f}$$"
+                else:
+                    solution = f"$$\\text{{Result: {area:.6f}}}$$"
                 r1_display = r1_str.replace('theta', '\\theta')
                 r2_display = r2_str.replace('theta', '\\theta')
+                sectors = details.get('sectors')
                 steps = [
-                    f"Finding area between polar curves: $$r_1 = {r1_display}$$ and $$r_2 = {r2_display}$$\n\nFound all intersection points. Integrated $$\\int \\frac{{r_{{\\text{{outer}}}}^2}}{{2}} \\, d\\theta - \\int \\frac{{r_{{\\text{{inner}}}}^2}}{{2}} \\, d\\theta$$ for each sector and added the result.",
+                    f"Finding area between polar curves: $$r_1 = {r1_display}$$ and $$r_2 = {r2_display}$$",
+                    f"Split the range at the intersection points and pole crossings into {len(sectors)} sectors. Integrated $$\\int \\frac{{r_{{\\text{{outer}}}}^2}}{{2}} \\, d\\theta - \\int \\frac{{r_{{\\text{{inner}}}}^2}}{{2}} \\, d\\theta$$ over each sector and added the results."
+                    if sectors else
+                    f"Found all intersection points. Integrated $$\\int \\frac{{r_{{\\text{{outer}}}}^2}}{{2}} \\, d\\theta - \\int \\frac{{r_{{\\text{{inner}}}}^2}}{{2}} \\, d\\theta$$ for each sector and added the result.",
+                    *polar_sector_steps(details),
                     f"Computed intersection area: {area:.6f}"
                 ]
+                if details.get('symmetry_factor', 1) > 1:
+                    steps.insert(1, polar_symmetry_step(details))
+                if details.get('overruns'):
+                    steps.insert(-1, polar_budget_step(details))
                 
             else:
                 r_str = clean_single_polar_expression(integral)
@@ -720,7 +805,7 @@ def solve_integral_api(current_user):
                 
                 theta = sp.Symbol('theta')
                 try:
-                    r_expr = sp.sympify(r_str)
+                    r_expr = sp.sympify(r_str, evaluate=False)
                 except Exception as parse_e:
                     return jsonify({'error': f'Invalid mathematical expression in polar function: {str(parse_e)}'}), 400
                 
@@ -728,18 +813,34 @@ def solve_integral_api(current_user):
                 if r_vars and theta not in r_vars:
                     return jsonify({'error': f'Polar function contains unknown variables: {r_vars}. Use "theta" as the variable.'}), 400
                 
+                r_expr = evaluate_polar_input(r_expr, theta)
+                
                 import numpy as np
                 zero_expr = sp.sympify("0")
-                area = solve_polar(zero_expr, r_expr, theta, theta_start=0.0, theta_end=2*np.pi)
+                area, details = polar_cache.solve_cached(
+                    lambda: run_shared_solver_task('polar', (r_expr,), solve_polar, zero_expr, r_expr, theta,
+                                                   theta_start=0.0, theta_end=2*np.pi, exact=True,
+                                                   return_details=True, name='polar'),
+                    zero_expr, r_expr, theta, theta_start=0.0, theta_end=2*np.pi, exact=True)
                 
-                solution = f"Area enclosed: {area:.6f}"
+                if details.get('exact') is not None:
+                    solution = f"Area enclosed: {details['exact']} ≈ {area:.6f}"
+                else:
+                    solution = f"Area enclosed: {area:.6f}"
                 r_display = r_str.replace('theta', '\\theta')
                 steps = [
                     f"Finding area enclosed by polar curve $$r = {r_display}$$",
                     "Using polar area formula: $$A = \\frac{1}{2}\\int_0^{2\\pi} r^2 \\, d\\theta$$",
                     f"Computed enclosed area: {area:.6f}"
                 ]
-
+                if details.get('symmetry_factor', 1) > 1:
+                    steps.insert(2, polar_symmetry_step(details))
+                if details.get('overruns'):
+                    steps.insert(-1, polar_budget_step(details))
+
+        except SolverWorkerError as e:
+            app.logger.error(f'Polar solver worker error: {str(e)}')
+            return jsonify({'error': e.user_message()}), 400
         except Exception as e:
             app.logger.error(f'Polar solver error: {str(e)}')
             return jsonify({'error': f'Polar solver error: {str(e)}'}), 400
@@ -764,6 +865,8 @@ def solve_integral_api(current_user):
                     xt = parts[0].replace("x(t)", "").replace("x(t) =", "").replace("x =", "").replace("=", "").strip()
                     yt = parts[1].replace("y(t)", "").replace("y(t) =", "").replace("y =", "").replace("=", "").strip()
                     display_input = f"x(t) = {xt}, y(t) = {yt}"
+                    if definite:
+                        display_input += f", {quantity} for t in [{lower}, {upper}]"
         
         elif solver_type == "polar":
             if "," in integral:
@@ -801,7 +904,7 @@ def solve_integral_api(current_user):
         else:
             formatted_input_latex = format_latex_expression(integral)
 
-        return jsonify({
+        response = {
             'input': integral,
             'input_latex': formatted_input_latex,
             'solution': solution_str,
@@ -810,12 +913,15 @@ def solve_integral_api(current_user):
             'solver_type': solver_type,
             'solved_at': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
             'id': new_problem.id
-        })
+        }
+        if sectors:
+            response['sectors'] = sectors
+        return jsonify(response)
 
     except Exception as db_e:
         db.session.rollback()
         app.logger.error(f'Database error: {str(db_e)}')
-        return jsonify({
+        response = {
             'input': integral,
             'input_latex': format_latex_expression(integral),
             'solution': solution_str,
@@ -824,7 +930,10 @@ def solve_integral_api(current_user):
             'solver_type': solver_type,
             'solved_at': datetime.utcnow().replace(tzinfo=timezone.utc).isoformat(),
             'db_warning': 'Solution computed but not saved to history'
-        })
+        }
+        if sectors:
+            response['sectors'] = sectors
+        return jsonify(response)
 
 @app.route('/api/solver/save', methods=['POST'])
 @token_required
@@ -887,6 +996,60 @@ def get_history(current_user):
     except Exception as e:
         return jsonify({'error': 'Failed to load history', 'details': str(e)}), 500
 
+@app.route('/api/plot')
+@token_required
+def plot_curve(current_user):
+    """
+    Sampled points of the curve for an expression, as base64 float32 x, y pairs,
+    or as the raw bytes with format=binary
+    """
+    expression = request.args.get('expression', '').strip()
+    solver_type = request.args.get('solverType', 'integral')
+
+    if not expression:
+        return jsonify({'error': 'Expression required'}), 400
+    if len(expression) > 500:
+        return jsonify({'error': 'Expression too long'}), 400
+
+    if solver_type == 'parametric':
+        texts = [p.strip() for p in expression.split(',')]
+        if len(texts) == 2:
+            texts[0] = texts[0].replace("x(t)", "").replace("x =", "").replace("=", "").strip()
+            texts[1] = texts[1].replace("y(t)", "").replace("y =", "").replace("=", "").strip()
+    elif solver_type == 'polar':
+        if ',' in expression:
+            return jsonify({'error': 'Plot one polar curve at a time'}), 400
+        texts = [clean_single_polar_expression(expression)]
+    else:
+        texts = [expression]
+
+    try:
+        payload, info = plot_data(solver_type, texts, lower=request.args.get('lower', type=float),
+                                  upper=request.args.get('upper', type=float),
+                                  pixels=request.args.get('pixels', DEFAULT_PIXELS, type=int))
+    except SolverWorkerError as e:
+        app.logger.error(f'Plot worker error: {str(e)}')
+        return jsonify({'error': e.user_message()}), 400
+    except Exception as e:
+        app.logger.error(f'Plot error: {str(e)}')
+        return jsonify({'error': f'Could not plot expression: {str(e)}'}), 400
+
+    if request.args.get('format') == 'binary':
+        response = app.response_class(payload, mimetype='application/octet-stream')
+        response.headers['X-Plot-Count'] = str(info['count'])
+        response.headers['X-Plot-Bounds'] = ','.join(repr(b) for b in info['bounds'])
+        return response
+    return jsonify(dict(info, data=encode_payload(payload)))
+
+@app.route('/api/solver/metrics')
+@token_required
+def get_solver_metrics(current_user):
+    return jsonify({
+        'metrics': metrics.snapshot(),
+        'guard_limits': GUARD_LIMITS,
+        'worker_limits': WORKER_LIMITS
+    })
+
 @app.route('/api/dev/clear-database', methods=['POST'])
 def clear_database():
     if not app.debug:
@@ -1030,53 +1193,23 @@ def get_random_problem(current_user):
         technique = request.args.get('technique')
         exclude_completed = request.args.get('exclude_completed', 'false').lower() == 'true'
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM practice_problems WHERE 1=1"
-        params = []
-        
-        if difficulty:
-            query += " AND difficulty = ?"
-            params.append(difficulty)
-        
-        if technique:
-            query += " AND technique = ?"
-            params.append(technique)
+        catalog = practice_catalog.current()
         
+        completed = None
         if exclude_completed:
-            completed_ids = [p.problem_id for p in UserProgress.query.filter_by(
-                user_id=current_user.id, completed=True
-            ).all()]
-            
-            if completed_ids:
-                placeholders = ','.join('?' * len(completed_ids))
-                query += f" AND id NOT IN ({placeholders})"
-                params.extend(completed_ids)
+            def completed(problem_ids):
+                return practice_catalog.completed_problem_ids(db.session, UserProgress, current_user.id, problem_ids)
         
-        query += " ORDER BY RANDOM() LIMIT 1"
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-        conn.close()
+        problem_id = catalog.sample('integral', difficulty, technique, completed=completed)
         
-        if not result:
+        if problem_id is None:
             return jsonify({'error': 'No problems found'}), 404
         
-        columns = ['id', 'problem_text', 'problem_latex', 'solution_text', 
-                  'solution_latex', 'technique', 'difficulty', 'hint', 'steps', 'created_at']
-        problem = dict(zip(columns, result))
-        problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-        
         progress = UserProgress.query.filter_by(
-            user_id=current_user.id, problem_id=problem['id']
+            user_id=current_user.id, problem_id=problem_id
         ).first()
         
-        problem['user_progress'] = {
-            'completed': progress.completed if progress else False,
-            'attempts': progress.attempts if progress else 0
-        }
-        
-        return jsonify({'problem': problem})
+        return problem_response('integral', catalog, problem_id, progress)
         
     except Exception as e:
         print(f"❌ Random problem error: {e}")
@@ -1093,46 +1226,23 @@ def get_problems_by_difficulty(current_user, difficulty):
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 20)
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM practice_problems WHERE difficulty = ?', (difficulty,))
-        total = cursor.fetchone()[0]
+        catalog = practice_catalog.current()
+        problem_ids = catalog.select('integral', difficulty)
+        total = len(problem_ids)
         
-        offset = (page - 1) * per_page
-        cursor.execute('''
-            SELECT * FROM practice_problems 
-            WHERE difficulty = ? 
-            ORDER BY id LIMIT ? OFFSET ?
-        ''', (difficulty, per_page, offset))
+        offset = max(page - 1, 0) * per_page
+        page_ids = problem_ids[offset:offset + per_page]
+        progress = practice_catalog.progress_by_problem(db.session, UserProgress, current_user.id, page_ids)
+        problems = [practice_catalog.problem_json(catalog.fragment('integral', problem_id), progress.get(problem_id))
+                    for problem_id in page_ids]
         
-        results = cursor.fetchall()
-        conn.close()
-        
-        columns = ['id', 'problem_text', 'problem_latex', 'solution_text', 
-                  'solution_latex', 'technique', 'difficulty', 'hint', 'steps', 'created_at']
-        
-        problems = []
-        for result in results:
-            problem = dict(zip(columns, result))
-            problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-            
-            progress = UserProgress.query.filter_by(
-                user_id=current_user.id, problem_id=problem['id']
-            ).first()
-            
-            problem['user_progress'] = {
-                'completed': progress.completed if progress else False,
-                'attempts': progress.attempts if progress else 0
-            }
-            problems.append(problem)
-        
-        return jsonify({
-            'problems': problems,
+        page_info = json.dumps({
             'total': total,
             'pages': (total + per_page - 1) // per_page,
             'current_page': page
         })
+        body = page_info[:-1] + ', "problems": [' + ', '.join(problems) + ']}'
+        return app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         print(f"❌ Problems by difficulty error: {e}")
@@ -1142,30 +1252,7 @@ def get_problems_by_difficulty(current_user, difficulty):
 def get_available_techniques():
     """Get all available integration techniques"""
     try:
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT technique, COUNT(*) as count, 
-                   MIN(difficulty) as min_difficulty,
-                   MAX(difficulty) as max_difficulty
-            FROM practice_problems 
-            GROUP BY technique 
-            ORDER BY technique
-        ''')
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        techniques = []
-        for technique, count, min_diff, max_diff in results:
-            techniques.append({
-                'name': technique,
-                'problem_count': count,
-                'difficulty_range': f"{min_diff}-{max_diff}"
-            })
-        
-        return jsonify({'techniques': techniques})
+        return jsonify({'techniques': practice_catalog.current().techniques['integral']})
         
     except Exception as e:
         print(f"❌ Techniques error: {e}")
@@ -1186,16 +1273,13 @@ def submit_practice_answer(current_user):
         if not problem_id or not user_answer:
             return jsonify({'error': 'Problem ID and answer required'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT solution_text FROM practice_problems WHERE id = ?', (problem_id,))
-        result = cursor.fetchone()
-        conn.close()
+        problem = practice_catalog.current().problem('integral', problem_id)
         
-        if not result:
+        if not problem:
             return jsonify({'error': 'Problem not found'}), 404
         
-        correct_answer = result[0]
+        problem_id = problem['id']
+        correct_answer = problem['solution_text']
         
         progress = UserProgress.query.filter_by(
             user_id=current_user.id, problem_id=problem_id
@@ -1241,11 +1325,7 @@ def get_practice_stats(current_user):
         total_attempted = UserProgress.query.filter_by(user_id=current_user.id).count()
         total_completed = UserProgress.query.filter_by(user_id=current_user.id, completed=True).count()
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM practice_problems')
-        total_available = cursor.fetchone()[0]
-        conn.close()
+        total_available = len(practice_catalog.current().problems['integral'])
         
         difficulty_progress = {}
         for diff in range(1, 8):
@@ -1269,30 +1349,15 @@ def get_practice_stats(current_user):
 def get_specific_problem(current_user, problem_id):
     """Get a specific practice problem by ID"""
     try:
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM practice_problems WHERE id = ?', (problem_id,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        catalog = practice_catalog.current()
+        if not catalog.problem('integral', problem_id):
             return jsonify({'error': 'Problem not found'}), 404
         
-        columns = ['id', 'problem_text', 'problem_latex', 'solution_text', 
-                  'solution_latex', 'technique', 'difficulty', 'hint', 'steps', 'created_at']
-        problem = dict(zip(columns, result))
-        problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-        
         progress = UserProgress.query.filter_by(
             user_id=current_user.id, problem_id=problem_id
         ).first()
         
-        problem['user_progress'] = {
-            'completed': progress.completed if progress else False,
-            'attempts': progress.attempts if progress else 0
-        }
-        
-        return jsonify({'problem': problem})
+        return problem_response('integral', catalog, problem_id, progress)
         
     except Exception as e:
         print(f"❌ Get specific problem error: {e}")
@@ -1306,44 +1371,22 @@ def get_practice_problems_by_difficulty(current_user, difficulty):
         if difficulty < 1 or difficulty > 4:
             return jsonify({'error': 'Difficulty must be between 1 and 4'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM practice_problems 
-            WHERE difficulty = ? 
-            ORDER BY id
-        ''', (difficulty,))
+        catalog = practice_catalog.current()
+        difficulty_problem_ids = catalog.select('integral', difficulty)
         
-        all_problems = cursor.fetchall()
-        conn.close()
-        
-        if not all_problems:
+        if not difficulty_problem_ids:
             return jsonify({'error': f'No problems found for difficulty {difficulty}'}), 404
         
-        attempted_problem_ids = [p.problem_id for p in UserProgress.query.filter_by(user_id=current_user.id).all()]
-        difficulty_problem_ids = [prob[0] for prob in all_problems]
-        
-        attempts_for_difficulty = len([pid for pid in attempted_problem_ids if pid in difficulty_problem_ids])
+        attempted = UserProgress.query.filter_by(user_id=current_user.id).all()
+        difficulty_id_set = set(difficulty_problem_ids)
+        attempts_for_difficulty = len([p for p in attempted if p.problem_id in difficulty_id_set])
         
-        problem_index = attempts_for_difficulty % len(all_problems)
-        result = all_problems[problem_index]
+        problem_index = attempts_for_difficulty % len(difficulty_problem_ids)
+        problem_id = difficulty_problem_ids[problem_index]
         
-        columns = ['id', 'problem_text', 'problem_latex', 'solution_text', 
-                  'solution_latex', 'technique', 'difficulty', 'hint', 'steps', 'created_at']
-        problem = dict(zip(columns, result))
-        problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-        
-        progress = UserProgress.query.filter_by(
-            user_id=current_user.id, problem_id=problem['id']
-        ).first()
-        
-        problem['user_progress'] = {
-            'completed': progress.completed if progress else False,
-            'attempts': progress.attempts if progress else 0
-        }
+        progress = next((p for p in attempted if p.problem_id == problem_id), None)
         
-        return jsonify({'problem': problem})
+        return problem_response('integral', catalog, problem_id, progress)
         
     except Exception as e:
         print(f"❌ Get practice problem error: {e}")
@@ -1357,43 +1400,22 @@ def get_parametric_problems_by_difficulty(current_user, difficulty):
         if difficulty < 1 or difficulty > 4:
             return jsonify({'error': 'Difficulty must be between 1 and 4'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
+        catalog = practice_catalog.current()
+        difficulty_problem_ids = catalog.select('parametric', difficulty)
         
-        cursor.execute('''
-            SELECT * FROM parametric_practice_problems 
-            WHERE difficulty = ? 
-            ORDER BY id
-        ''', (difficulty,))
-        
-        all_problems = cursor.fetchall()
-        conn.close()
-        
-        if not all_problems:
+        if not difficulty_problem_ids:
             return jsonify({'error': f'No parametric problems found for difficulty {difficulty}'}), 404
         
-        attempted_problem_ids = [p.problem_id for p in ParametricUserProgress.query.filter_by(user_id=current_user.id).all()]
-        difficulty_problem_ids = [prob[0] for prob in all_problems]
-        attempts_for_difficulty = len([pid for pid in attempted_problem_ids if pid in difficulty_problem_ids])
-        
-        problem_index = attempts_for_difficulty % len(all_problems)
-        result = all_problems[problem_index]
+        attempted = ParametricUserProgress.query.filter_by(user_id=current_user.id).all()
+        difficulty_id_set = set(difficulty_problem_ids)
+        attempts_for_difficulty = len([p for p in attempted if p.problem_id in difficulty_id_set])
         
-        columns = ['id', 'x_t_text', 'x_t_latex', 'y_t_text', 'y_t_latex',
-                  'solution_text', 'solution_latex', 'difficulty', 'hint', 'steps', 'created_at']
-        problem = dict(zip(columns, result))
-        problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-        
-        progress = ParametricUserProgress.query.filter_by(
-            user_id=current_user.id, problem_id=problem['id']
-        ).first()
+        problem_index = attempts_for_difficulty % len(difficulty_problem_ids)
+        problem_id = difficulty_problem_ids[problem_index]
         
-        problem['user_progress'] = {
-            'completed': progress.completed if progress else False,
-            'attempts': progress.attempts if progress else 0
-        }
+        progress = next((p for p in attempted if p.problem_id == problem_id), None)
         
-        return jsonify({'problem': problem})
+        return problem_response('parametric', catalog, problem_id, progress)
         
     except Exception as e:
         print(f"❌ Get parametric problem error: {e}")
@@ -1414,16 +1436,13 @@ def submit_parametric_answer(current_user):
         if not problem_id or not user_answer:
             return jsonify({'error': 'Problem ID and answer required'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT solution_text FROM parametric_practice_problems WHERE id = ?', (problem_id,))
-        result = cursor.fetchone()
-        conn.close()
+        problem = practice_catalog.current().problem('parametric', problem_id)
         
-        if not result:
+        if not problem:
             return jsonify({'error': 'Problem not found'}), 404
         
-        correct_answer = result[0]
+        problem_id = problem['id']
+        correct_answer = problem['solution_text']
         
         progress = ParametricUserProgress.query.filter_by(
             user_id=current_user.id, problem_id=problem_id
@@ -1478,28 +1497,21 @@ def handle_give_up(current_user):
         
         if problem_type == 'parametric':
             ProgressModel = ParametricUserProgress
-            table_name = 'parametric_practice_problems'
+            kind = 'parametric'
         elif problem_type == 'polar':
             ProgressModel = PolarUserProgress
-            table_name = 'polar_practice_problems'
+            kind = 'polar'
         else:
             ProgressModel = UserProgress
-            table_name = 'practice_problems'
-        
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        if problem_type == 'polar':
-            cursor.execute(f'SELECT solution_text FROM {table_name} WHERE id = ?', (problem_id,))
-        else:
-            cursor.execute(f'SELECT solution_text, solution_latex FROM {table_name} WHERE id = ?', (problem_id,))
+            kind = 'integral'
         
-        result = cursor.fetchone()
-        conn.close()
+        problem = practice_catalog.current().problem(kind, problem_id)
         
-        if not result:
+        if not problem:
             return jsonify({'error': 'Problem not found'}), 404
         
+        problem_id = problem['id']
+        
         progress = ProgressModel.query.filter_by(
             user_id=current_user.id, problem_id=problem_id
         ).first()
@@ -1518,13 +1530,13 @@ def handle_give_up(current_user):
         db.session.commit()
         
         response_data = {
-            'correct_answer': result[0],
+            'correct_answer': problem['solution_text'],
             'attempts': progress.attempts,
             'message': 'Problem skipped'
         }
         
-        if problem_type != 'polar' and len(result) > 1:
-            response_data['correct_answer_latex'] = result[1]
+        if kind != 'polar':
+            response_data['correct_answer_latex'] = problem['solution_latex']
         
         return jsonify(response_data)
         
@@ -1541,46 +1553,22 @@ def get_polar_problems_by_difficulty(current_user, difficulty):
         if difficulty < 1 or difficulty > 4:
             return jsonify({'error': 'Difficulty must be between 1 and 4'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM polar_practice_problems 
-            WHERE difficulty = ? 
-            ORDER BY id
-        ''', (difficulty,))
-        
-        all_problems = cursor.fetchall()
-        conn.close()
+        catalog = practice_catalog.current()
+        difficulty_problem_ids = catalog.select('polar', difficulty)
         
-        if not all_problems:
+        if not difficulty_problem_ids:
             return jsonify({'error': f'No polar problems found for difficulty {difficulty}'}), 404
         
-        attempted_problem_ids = [p.problem_id for p in PolarUserProgress.query.filter_by(user_id=current_user.id).all()]
-        difficulty_problem_ids = [prob[0] for prob in all_problems]
-        attempts_for_difficulty = len([pid for pid in attempted_problem_ids if pid in difficulty_problem_ids])
+        attempted = PolarUserProgress.query.filter_by(user_id=current_user.id).all()
+        difficulty_id_set = set(difficulty_problem_ids)
+        attempts_for_difficulty = len([p for p in attempted if p.problem_id in difficulty_id_set])
         
-        problem_index = attempts_for_difficulty % len(all_problems)
-        result = all_problems[problem_index]
+        problem_index = attempts_for_difficulty % len(difficulty_problem_ids)
+        problem_id = difficulty_problem_ids[problem_index]
         
-        columns = ['id', 'inner_function_text', 'inner_function_latex', 'outer_function_text', 'outer_function_latex',
-                  'lower_bound', 'upper_bound', 'solution_text', 'solution_latex', 'difficulty', 'hint', 'steps', 'created_at']
-        problem = dict(zip(columns, result))
-        problem['steps'] = problem['steps'].split('\n') if problem['steps'] else []
-        
-        problem['lower_bound_display'] = format_bound_for_display(problem['lower_bound'])
-        problem['upper_bound_display'] = format_bound_for_display(problem['upper_bound'])
-        
-        progress = PolarUserProgress.query.filter_by(
-            user_id=current_user.id, problem_id=problem['id']
-        ).first()
-        
-        problem['user_progress'] = {
-            'completed': progress.completed if progress else False,
-            'attempts': progress.attempts if progress else 0
-        }
+        progress = next((p for p in attempted if p.problem_id == problem_id), None)
         
-        return jsonify({'problem': problem})
+        return problem_response('polar', catalog, problem_id, progress)
         
     except Exception as e:
         print(f"❌ Get polar problem error: {e}")
@@ -1601,16 +1589,13 @@ def submit_polar_answer(current_user):
         if not problem_id or not user_answer:
             return jsonify({'error': 'Problem ID and answer required'}), 400
         
-        conn = sqlite3.connect('practice_integrals.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT solution_text FROM polar_practice_problems WHERE id = ?', (problem_id,))
-        result = cursor.fetchone()
-        conn.close()
+        problem = practice_catalog.current().problem('polar', problem_id)
         
-        if not result:
+        if not problem:
             return jsonify({'error': 'Problem not found'}), 404
         
-        correct_answer = result[0]
+        problem_id = problem['id']
+        correct_answer = problem['solution_text']
         
         progress = PolarUserProgress.query.filter_by(
             user_id=current_user.id, problem_id=problem_id
@@ -1628,10 +1613,10 @@ def submit_polar_answer(current_user):
         progress.attempts += 1
         
         try:
-            user_float = round(float(user_answer), 3)
-            correct_float = round(float(correct_answer), 3)
+            user_float = round(polar_answer_value(user_answer), 3)
+            correct_float = round(polar_answer_value(correct_answer), 3)
             is_correct = abs(user_float - correct_float) < 0.001
-        except ValueError:
+        except (ValueError, TypeError):
             is_correct = False
         
         if is_correct and not progress.completed:
@@ -0,0 +1,245 @@
+import json
+import math
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import sympy as sp
+from backend.polar_solver import solve_polar
+from backend.settings import data_path
+
+theta = sp.Symbol('theta')
+
+# A case fails if its error exceeds ACCURACY_BUDGET (relative to max(1, area))
+# or it takes longer than LATENCY_BUDGET seconds
+ACCURACY_BUDGET = float(os.environ.get('POLAR_BENCHMARK_ACCURACY') or 1e-7)
+LATENCY_BUDGET = float(os.environ.get('POLAR_BENCHMARK_LATENCY') or 2.0)
+# Against a saved baseline, a case regresses if its error grows tenfold (above
+# ERROR_FLOOR), and a family if its mean time exceeds LATENCY_SLACK
+# times the baseline mean plus 10 ms
+BASELINE_PATH = os.environ.get('POLAR_BENCHMARK_BASELINE') or data_path('polar_benchmark_baseline.json')
+ERROR_FLOOR = 1e-12
+LATENCY_SLACK = 2.0
+
+
+def _lens_area(r1, r2, d):
+    """Area shared by two intersecting circles with radii r1, r2 and centres d apart"""
+    return (r1**2 * math.acos((d**2 + r1**2 - r2**2) / (2 * d * r1))
+            + r2**2 * math.acos((d**2 + r2**2 - r1**2) / (2 * d * r2))
+            - 0.5 * math.sqrt((-d + r1 + r2) * (d + r1 - r2) * (d - r1 + r2) * (d + r1 + r2)))
+
+
+def rose_cases():
+    """
+    r = a·cos(nθ), a·sin(nθ): n petals of total area πa²/4 for odd n, 2n petals
+    of πa²/2 for even n; alone and inside the circle r = 4
+    """
+    cases = []
+    for a in (sp.Rational(1, 2), 1, 2, 3):
+        for n in range(1, 13):
+            area = math.pi * float(a)**2 / (4 if n % 2 else 2)
+            for trig in (sp.cos, sp.sin):
+                cases.append(('rose', a * trig(n * theta), sp.Integer(0), area))
+                # The rose never reaches the circle r = 4, so this takes the no-intersection path
+                cases.append(('rose in circle', sp.Integer(4), a * trig(n * theta), 16 * math.pi - area))
+    return cases
+
+
+def cardioid_cases():
+    """r = a(1 ± cos θ), a(1 ± sin θ): area 3πa²/2"""
+    cases = []
+    for a in range(1, 6):
+        for trig in (sp.cos, sp.sin):
+            for sign in (1, -1):
+                cases.append(('cardioid', a * (1 + sign * trig(theta)), sp.Integer(0), 1.5 * math.pi * a**2))
+    return cases
+
+
+def limacon_cases():
+    """
+    r = b + a·cos θ with a > b > 0 has an inner loop; the region it encloses is
+    bounded by the outer loop, of area b²α + 2ab·sin α + a²(α/2 + sin 2α/4), α = arccos(−b/a)
+    """
+    cases = []
+    for b in (sp.Rational(1, 2), 1, sp.Rational(3, 2), 2):
+        # The set drops repeats such as b + 1/2 == 2b for b = 1/2, which would share a result key
+        for a in sorted({b + sp.Rational(1, 2), b + 1, 2 * b, 3 * b, b + 3}):
+            fa, fb = float(a), float(b)
+            alpha = math.acos(-fb / fa)
+            area = fb**2 * alpha + 2 * fa * fb * math.sin(alpha) + fa**2 * (alpha / 2 + math.sin(2 * alpha) / 4)
+            for trig in (sp.cos, sp.sin):
+                cases.append(('limacon', b + a * trig(theta), sp.Integer(0), area))
+    return cases
+
+
+def circle_pair_cases():
+    """
+    Circles r = c about the pole, r = 2R·cos θ (radius R through the pole) and
+    r = 2b·sin θ, compared pairwise through the lens area of two circles
+    """
+    cases = []
+    radii = (sp.Rational(1, 2), 1, sp.Rational(3, 2), 2, sp.Rational(5, 2), 3)
+    for R in (1, sp.Rational(3, 2), 2):
+        for c in radii:
+            fR, fc = float(R), float(c)
+            if not fc < 2 * fR:
+                continue
+            lens = _lens_area(fc, fR, fR)
+            for trig in (sp.cos, sp.sin):
+                through_pole = 2 * R * trig(theta)
+                cases.append(('circle pair', through_pole, c, math.pi * fR**2 - lens))
+                cases.append(('circle pair', c, through_pole, math.pi * fc**2 - lens))
+
+    for c1 in radii:
+        for c2 in radii:
+            if c1 != c2:
+                cases.append(('circle pair', c1, c2, math.pi * max(float(c1)**2 - float(c2)**2, 0.0)))
+
+    for a in (sp.Rational(1, 2), 1, sp.Rational(3, 2), 2):
+        for b in (sp.Rational(1, 2), 1, sp.Rational(3, 2), 2):
+            fa, fb = float(a), float(b)
+            lens = _lens_area(fa, fb, math.hypot(fa, fb))
+            cases.append(('circle pair', 2 * a * sp.cos(theta), 2 * b * sp.sin(theta), math.pi * fa**2 - lens))
+            cases.append(('circle pair', 2 * b * sp.sin(theta), 2 * a * sp.cos(theta), math.pi * fb**2 - lens))
+    return cases
+
+
+def lemniscate_cases():
+    """
+    Lemniscates r² = a²·cos 2θ (area a²), the pair rotated 45° apart (a²/√2
+    inside one and outside the other), and the lemniscate outside the circle r = c
+    (a²·sin 2φ − 2c²φ with cos 2φ = c²/a²)
+    """
+    cases = []
+    for a in (1, 2, 3):
+        lemniscate = a * sp.sqrt(sp.cos(2 * theta))
+        rotated = a * sp.sqrt(sp.sin(2 * theta))
+        cases.append(('lemniscate', lemniscate, sp.Integer(0), float(a**2)))
+        cases.append(('lemniscate', rotated, sp.Integer(0), float(a**2)))
+        cases.append(('lemniscate', lemniscate, rotated, a**2 / math.sqrt(2)))
+        cases.append(('lemniscate', rotated, lemniscate, a**2 / math.sqrt(2)))
+        for c in (sp.Rational(1, 4), sp.Rational(1, 2), sp.Rational(3, 4)):
+            fc = float(c) * a
+            phi = 0.5 * math.acos(fc**2 / a**2)
+            cases.append(('lemniscate', lemniscate, c * a, a**2 * math.sin(2 * phi) - 2 * fc**2 * phi))
+    return cases
+
+
+def cardioid_circle_cases():
+    """Cardioid r = a(1 + cos θ) against the circle r = a: a²(π/4 + 2) outside the circle, a²(2 − π/4) inside"""
+    cases = []
+    for a in range(1, 6):
+        for trig in (sp.cos, sp.sin):
+            cardioid = a * (1 + trig(theta))
+            cases.append(('cardioid/circle', cardioid, sp.Integer(a), a**2 * (math.pi / 4 + 2)))
+            cases.append(('cardioid/circle', sp.Integer(a), cardioid, a**2 * (2 - math.pi / 4)))
+    return cases
+
+
+def benchmark_cases():
+    """(family, inner, outer, exact area) for every configuration"""
+    return (rose_cases() + cardioid_cases() + limacon_cases() + circle_pair_cases()
+            + lemniscate_cases() + cardioid_circle_cases())
+
+
+class PolarBenchmark:
+    def __init__(self, baseline_path=BASELINE_PATH):
+        self.baseline_path = baseline_path
+        self.results = {}
+        self.failures = []
+
+    def run_case(self, family, inner, outer, expected):
+        """Solve one configuration and record its error and time"""
+        key = f"{inner}|{outer}"
+        if key in self.results:
+            self.failures.append(f"{key}: duplicate case, its result would overwrite the earlier one")
+            return
+        start = time.perf_counter()
+        try:
+            area = float(solve_polar(sp.sympify(inner), sp.sympify(outer), theta))
+        except Exception as e:
+            area = float('nan')
+            self.failures.append(f"{key}: {e}")
+        elapsed = time.perf_counter() - start
+
+        error = abs(area - expected) if not math.isnan(area) else float('inf')
+        self.results[key] = {'family': family, 'expected': expected, 'area': area,
+                             'error': error, 'seconds': elapsed}
+        if error > ACCURACY_BUDGET * max(1.0, abs(expected)):
+            self.failures.append(f"{key}: area {area}, expected {expected} (error {error:.2e})")
+        if elapsed > LATENCY_BUDGET:
+            self.failures.append(f"{key}: took {elapsed:.2f}s (budget {LATENCY_BUDGET}s)")
+
+    def compare_baseline(self):
+        """Report cases whose error, or groups whose mean time, regressed against the saved baseline"""
+        try:
+            with open(self.baseline_path) as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError):
+            print(f"⚠️  No baseline at {self.baseline_path}, checking absolute budgets only")
+            return
+
+        for key, result in self.results.items():
+            previous = baseline.get(key)
+            if previous is not None and result['error'] > max(10 * previous['error'], ERROR_FLOOR):
+                self.failures.append(f"{key}: error regressed from {previous['error']:.2e} to {result['error']:.2e}")
+
+        # Single solves are too noisy to time against each other, so compare family means
+        previous_groups = self.groups(baseline)
+        for family, results in self.groups(self.results).items():
+            previous = previous_groups.get(family)
+            if not previous:
+                continue
+            mean = sum(r['seconds'] for r in results) / len(results)
+            previous_mean = sum(r['seconds'] for r in previous) / len(previous)
+            if mean > LATENCY_SLACK * previous_mean + 0.01:
+                self.failures.append(f"{family}: mean time regressed from "
+                                     f"{previous_mean * 1000:.0f} ms to {mean * 1000:.0f} ms")
+
+    @staticmethod
+    def groups(results):
+        """Results grouped by family"""
+        groups = {}
+        for result in results.values():
+            groups.setdefault(result['family'], []).append(result)
+        return groups
+
+    def summary(self):
+        """Worst error, mean and slowest time per family"""
+        for family, results in sorted(self.groups(self.results).items()):
+            worst = max(r['error'] for r in results)
+            mean = sum(r['seconds'] for r in results) / len(results)
+            slowest = max(r['seconds'] for r in results)
+            print(f"{family:>16}: {len(results):4d} cases, max error {worst:.1e}, "
+                  f"mean {mean * 1000:.0f} ms, max {slowest * 1000:.0f} ms")
+
+    def run(self, update_baseline=False):
+        cases = benchmark_cases()
+        print(f"🔄 Benchmarking {len(cases)} polar configurations...")
+        start_time = time.time()
+        for family, inner, outer, expected in cases:
+            self.run_case(family, inner, outer, expected)
+
+        self.summary()
+        if update_baseline:
+            with open(self.baseline_path, 'w') as f:
+                json.dump({'results': self.results}, f, indent=1, sort_keys=True)
+            print(f"✅ Saved baseline to {self.baseline_path}")
+        else:
+            self.compare_baseline()
+
+        print(f"Finished {len(self.results)} solves in {time.time() - start_time:.1f} seconds")
+        for failure in self.failures:
+            print(f"❌ {failure}")
+        return not self.failures
+
+
+def main():
+    """Run the benchmark; exits nonzero if any budget or baseline check fails"""
+    ok = PolarBenchmark().run(update_baseline='--update-baseline' in sys.argv)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
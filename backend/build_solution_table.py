@@ -0,0 +1,123 @@
+import sqlite3
+import sys, os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import sympy as sp
+from backend.integral_solver import solve_integral
+from backend.parametric_solver import solve_parametric
+from backend.polar_solver import solve_polar
+from backend.solver_worker import run_solver_task
+from backend.solution_table import canonical_key, write_table, TABLE_PATH
+
+
+class SolutionTableBuilder:
+    def __init__(self, db_name='practice_integrals.db', table_path=TABLE_PATH):
+        self.db_name = db_name
+        self.table_path = table_path
+        self.entries = {}
+        self.failures = 0
+
+    def fetch_rows(self, query):
+        """Read generated problems; missing tables just mean that generator hasn't run"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query)
+            return cursor.fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Skipping: {e}")
+            return []
+        finally:
+            conn.close()
+
+    def add_entry(self, key, label, solve):
+        """Solve one problem with the real solver and store the result under key"""
+        if key in self.entries:
+            return
+        try:
+            entry = solve()
+        except Exception as e:
+            print(f"❌ {label}: {e}")
+            self.failures += 1
+            return
+        if entry is None:
+            print(f"❌ {label}: no solution")
+            self.failures += 1
+            return
+        self.entries[key] = entry
+
+    def build_integral_entries(self):
+        """Solve every integral practice problem, keeping the full steps"""
+        rows = self.fetch_rows('SELECT problem_text FROM practice_problems')
+        print(f"🔄 Solving {len(rows)} integral practice problems...")
+
+        def solve(text):
+            solution, steps = run_solver_task(solve_integral, text, "x", name='table_build')
+            if str(solution).startswith('Error'):
+                return None
+            return {'solver_type': 'integral', 'solution': solution, 'steps': steps}
+
+        for (text,) in rows:
+            self.add_entry(canonical_key('integral', text), text, lambda: solve(text))
+
+    def build_parametric_entries(self):
+        """Solve every parametric practice problem, keeping the full steps"""
+        rows = self.fetch_rows('SELECT x_t_text, y_t_text FROM parametric_practice_problems')
+        print(f"🔄 Solving {len(rows)} parametric practice problems...")
+
+        def solve(xt, yt):
+            solution, steps = run_solver_task(solve_parametric, xt, yt, "t", name='table_build')
+            if str(solution).startswith('Error'):
+                return None
+            return {'solver_type': 'parametric', 'solution': solution, 'steps': steps}
+
+        for xt, yt in rows:
+            self.add_entry(canonical_key('parametric', xt, yt), f"{xt}, {yt}", lambda: solve(xt, yt))
+
+    def build_polar_entries(self):
+        """
+        Compute the area, exact form and sectors the solver returns for every
+        polar practice pair. Solves that ran out of time are left out.
+        """
+        rows = self.fetch_rows('SELECT inner_function_text, outer_function_text FROM polar_practice_problems')
+        print(f"🔄 Solving {len(rows)} polar practice problems...")
+        theta = sp.Symbol('theta')
+
+        def solve(inner, outer):
+            inner_expr = sp.sympify(inner.replace('θ', 'theta'))
+            outer_expr = sp.sympify(outer.replace('θ', 'theta'))
+            area, details = run_solver_task(solve_polar, outer_expr, inner_expr, theta, exact=True,
+                                            return_details=True, name='table_build')
+            if details.get('overruns'):
+                return None
+            return {'solver_type': 'polar', 'area': float(area), 'details': details}
+
+        for inner, outer in rows:
+            self.add_entry(canonical_key('polar', inner, outer), f"{inner}, {outer}", lambda: solve(inner, outer))
+
+    def build(self):
+        start_time = time.time()
+        self.build_integral_entries()
+        self.build_parametric_entries()
+        self.build_polar_entries()
+        write_table(self.entries, self.table_path)
+
+        elapsed = time.time() - start_time
+        print(f"✅ Wrote {len(self.entries)} entries to {self.table_path} in {elapsed:.1f} seconds")
+        if self.failures:
+            print(f"⚠️  {self.failures} problems could not be solved and were left out")
+
+
+def main():
+    """Build the precomputed solution table from the generated practice problems"""
+    try:
+        SolutionTableBuilder().build()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
+from sympy.functions.elementary.hyperbolic import HyperbolicFunction
+
+from backend import metrics
+from backend.settings import env_number
+
+
+# Each size measure has three thresholds: above `cheap_*` the solve skips the
+# global simplify, above `isolate_*` it also runs in a memory-capped worker,
+# and above `reject_*` it is refused outright.
+GUARD_LIMITS = {
+    'cheap_depth': env_number('SOLVER_GUARD_CHEAP_DEPTH', 20),
+    'cheap_nodes': env_number('SOLVER_GUARD_CHEAP_NODES', 250),
+    'cheap_degree': env_number('SOLVER_GUARD_CHEAP_DEGREE', 30),
+    'cheap_exponent': env_number('SOLVER_GUARD_CHEAP_EXPONENT', 50),
+    'cheap_functions': env_number('SOLVER_GUARD_CHEAP_FUNCTIONS', 8),
+
+    'isolate_depth': env_number('SOLVER_GUARD_ISOLATE_DEPTH', 35),
+    'isolate_nodes': env_number('SOLVER_GUARD_ISOLATE_NODES', 800),
+    'isolate_degree': env_number('SOLVER_GUARD_ISOLATE_DEGREE', 80),
+    'isolate_exponent': env_number('SOLVER_GUARD_ISOLATE_EXPONENT', 200),
+    'isolate_functions': env_number('SOLVER_GUARD_ISOLATE_FUNCTIONS', 16),
+
+    'reject_depth': env_number('SOLVER_GUARD_REJECT_DEPTH', 60),
+    'reject_nodes': env_number('SOLVER_GUARD_REJECT_NODES', 2000),
+    'reject_degree': env_number('SOLVER_GUARD_REJECT_DEGREE', 200),
+    'reject_exponent': env_number('SOLVER_GUARD_REJECT_EXPONENT', 1000),
+    'reject_functions': env_number('SOLVER_GUARD_REJECT_FUNCTIONS', 40),
+
+    'cheap_budget': env_number('SOLVER_GUARD_CHEAP_BUDGET', 10.0),
+    'isolated_timeout': env_number('SOLVER_GUARD_ISOLATED_TIMEOUT', 30.0),
+    'isolated_memory_mb': env_number('SOLVER_GUARD_ISOLATED_MEMORY_MB', 512),
+}
+
+MEASURES = ('depth', 'nodes', 'degree', 'exponent', 'functions')
+
+
+def _numeric_exponent(node):
+    """Absolute value of a numeric exponent, or None if it is symbolic"""
+    try:
+        if node.exp.is_number:
+            return abs(float(node.exp))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _effective_degree(node, var, exponent_cap):
+    """
+    Degree the expression would reach if fully expanded in `var`.
+    Function arguments count with their own degree, so sin(x**40) reports 40.
+    """
+    if node == var:
+        return 1
+    if not node.has(var):
+        return 0
+    if node.is_Add or node.is_Function:
+        return max(_effective_degree(a, var, exponent_cap) for a in node.args)
+    if node.is_Mul:
+        return sum(_effective_degree(a, var, exponent_cap) for a in node.args)
+    if node.is_Pow:
+        base_degree = _effective_degree(node.base, var, exponent_cap)
+        exponent = _numeric_exponent(node)
+        if exponent is None:
+            return base_degree + _effective_degree(node.exp, var, exponent_cap)
+        return base_degree * min(exponent, exponent_cap)
+    return max((_effective_degree(a, var, exponent_cap) for a in node.args), default=0)
+
+
+def analyze_expression(expr, var):
+    """
+    Measure the size of a parsed expression: tree depth, node count,
+    effective polynomial degree, largest numeric exponent and the number of
+    trig/hyperbolic function nodes.
+    """
+    depth = 0
+    nodes = 0
+    max_exponent = 0.0
+    functions = 0
+    stack = [(expr, 1)]
+
+    while stack:
+        node, level = stack.pop()
+        nodes += 1
+        depth = max(depth, level)
+        if node.is_Pow:
+            exponent = _numeric_exponent(node)
+            if exponent is not None:
+                max_exponent = max(max_exponent, exponent)
+        elif isinstance(node, (TrigonometricFunction, HyperbolicFunction)):
+            functions += 1
+        if nodes > GUARD_LIMITS['reject_nodes'] or depth > GUARD_LIMITS['reject_depth']:
+            break
+        stack.extend((arg, level + 1) for arg in node.args)
+
+    stats = {
+        'depth': depth,
+        'nodes': nodes,
+        'exponent': max_exponent,
+        'functions': functions,
+        'degree': 0,
+    }
+
+    if depth <= GUARD_LIMITS['reject_depth'] and nodes <= GUARD_LIMITS['reject_nodes']:
+        try:
+            stats['degree'] = _effective_degree(expr, var, GUARD_LIMITS['reject_exponent'] + 1)
+        except (TypeError, ValueError, RecursionError):
+            stats['degree'] = 0
+
+    return stats
+
+
+def choose_pipeline(stats):
+    """
+    Pick the solve pipeline for the measured expression.
+    Returns one of 'full', 'cheap', 'isolated' or 'reject'.
+    """
+    for tier in ('reject', 'isolate', 'cheap'):
+        if any(stats[m] > GUARD_LIMITS[f'{tier}_{m}'] for m in MEASURES):
+            return 'isolated' if tier == 'isolate' else tier
+    return 'full'
+
+
+def exceeded_limits(stats, tier='reject'):
+    """List the measures that are over the given tier's limits"""
+    return [m for m in MEASURES if stats[m] > GUARD_LIMITS[f'{tier}_{m}']]
+
+
+def inline_safe(expr, var):
+    """
+    True if the expression is below the 'isolate' limits, so it may be
+    evaluated (doit, lambdify) in the request process, e.g. to build a cache
+    key. Anything larger is only evaluated inside a solver worker.
+    """
+    try:
+        return choose_pipeline(analyze_expression(expr, var)) in ('full', 'cheap')
+    except (TypeError, ValueError, OverflowError, RecursionError):
+        return False
+
+
+def check_expression(expr, var):
+    """Analyze an expression, record the measurements and return (pipeline, stats)"""
+    stats = analyze_expression(expr, var)
+    pipeline = choose_pipeline(stats)
+
+    metrics.increment(f'guard.pipeline.{pipeline}')
+    for measure in MEASURES:
+        metrics.observe(f'guard.{measure}', stats[measure])
+
+    return pipeline, stats
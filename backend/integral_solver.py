@@ -15,6 +15,11 @@ import threading
 import time
 import traceback
 
+from backend.expression_guard import check_expression, exceeded_limits, GUARD_LIMITS
+from backend.solver_worker import run_isolated, SolverWorkerError
+from backend.strategy_stats import structural_signature, order_strategies
+from backend import metrics
+
 s = "\\quad"
 
 base_local_dict = {
@@ -31,6 +36,23 @@ non_elem_funcs = (erf, erfc, erfi, Ei, Si, Ci, Shi, Chi, fresnelc, fresnels, pol
 
 steps_log = []
 
+# Seconds a full solve may spend on step-by-step strategies before it falls
+# back to direct integration
+SOLVE_TIME_LIMIT = 60
+_deadline = None
+
+class SolveTimeout(Exception):
+    """Raised between strategies once the current solve's deadline has passed"""
+
+def start_deadline(seconds=SOLVE_TIME_LIMIT):
+    """Start the time limit shared by every stage of the current solve"""
+    global _deadline
+    _deadline = time.monotonic() + seconds
+
+def check_deadline():
+    if _deadline is not None and time.monotonic() > _deadline:
+        raise SolveTimeout()
+
 def latex_format(expr):
     """Convert sympy expression to LaTeX format"""
     from sympy import latex
@@ -558,38 +580,44 @@ def get_pfd_coeffs(expr, var):
     log_step(f"\\text{{Result: }} \\boxed{{{latex_format(result)} + C}}")
     return result
 
+def try_special_integral(expr, var):
+    if check_sin_cos_exp(expr, var):
+        return special_integral(expr, var)
+    return False
+
+def try_partial_fractions(expr, var):
+    if is_rational_function(expr, var):
+        return get_pfd_coeffs(expr, var)
+    return False
+
+strategies = {
+    'special': try_special_integral,
+    'basic': basic,
+    'u_substitution': try_u_substitution,
+    'trig_substitution': check_trig_sub,
+    'partial_fractions': try_partial_fractions,
+    'integration_by_parts': ibp,
+}
+
 def solve_integral_internal(expr, var):
     """Internal solver that doesn't clear steps or handle the main parsing"""
+    check_deadline()
     try:
-        if check_sin_cos_exp(expr, var):
-            return special_integral(expr, var)
-        
-        basic_result = basic(expr, var)
-        if basic_result is not False:
-            return basic_result
-        
-        u_sub_result = try_u_substitution(expr, var)
-        if u_sub_result is not False:
-            return u_sub_result
-        
-        trig_sub = check_trig_sub(expr, var)
-        if trig_sub is not False:
-            return trig_sub
-        
-        if is_rational_function(expr, var):
-            pfd_result = get_pfd_coeffs(expr, var)
-            if pfd_result is not None:
-                return pfd_result
-        
-        ibp_result = ibp(expr, var)
-        if ibp_result is not False:
-            return ibp_result
+        signature = structural_signature(expr, var)
+        for name in order_strategies(signature):
+            result = strategies[name](expr, var)
+            if result is not False and result is not None:
+                metrics.increment(f'strategy.{name}')
+                return result
+            check_deadline()
         
         log_step(r"\text{Using direct integration}")
         result = integrate(expr, var)
         log_step(f"\\text{{Final result: }} \\boxed{{{latex_format(result)} + C}}")
         return result
         
+    except SolveTimeout:
+        raise
     except Exception as e:
         try:
             log_step(r"\text{Using direct integration method}")
@@ -599,11 +627,21 @@ def solve_integral_internal(expr, var):
         except:
             raise
 
-def solve_integral(expr_str, var_str='x'):
-    """Main function that returns (solution, steps) tuple with comprehensive error handling"""
-    clear_steps()
-    
-    if not expr_str or expr_str.strip() == '':
+def solve_integral(expr_str, var_str='x', pipeline=None, presimplified=False, nested=False):
+    """
+    Main function that returns (solution, steps) tuple with comprehensive error handling.
+    `pipeline` forces 'full' or 'cheap'; by default it is picked by the expression guard.
+    `expr_str` may also be a SymPy expression; pass presimplified=True if the
+    caller has already simplified it. A solver calling in as one stage of its
+    own solve passes nested=True: the steps it logged so far are kept, and the
+    integration runs on the caller's thread under the deadline the caller
+    started instead of a timeout thread of its own.
+    """
+    if not nested:
+        clear_steps()
+        start_deadline(GUARD_LIMITS['cheap_budget'] if pipeline == 'cheap' else SOLVE_TIME_LIMIT)
+    
+    if expr_str is None or (not hasattr(expr_str, "is_Atom") and str(expr_str).strip() == ''):
         return "Error: Empty input. Please enter an expression to integrate.", []
     
     try:
@@ -611,6 +649,32 @@ def solve_integral(expr_str, var_str='x'):
     except Exception as e:
         return f"Error: Invalid variable '{var_str}'. Please use a valid variable name.", []
     
+    if pipeline is None:
+        expr, error = safe_parse_expr(expr_str) if not hasattr(expr_str, "is_Atom") else (expr_str, None)
+        pipeline = 'full'
+        if not error:
+            pipeline, stats = check_expression(expr, var)
+        
+        if pipeline == 'reject':
+            too_large = ", ".join(exceeded_limits(stats))
+            log_step(r"\text{This expression is too large to integrate safely}")
+            log_step(f"\\text{{Limits exceeded: {too_large}}}")
+            return "Error: Expression is too large or deeply nested to integrate. Please simplify it and try again.", get_steps()
+        
+        if pipeline == 'isolated':
+            try:
+                return run_isolated(
+                    solve_integral, (expr_str, var_str, 'cheap'), {'nested': nested},
+                    timeout=GUARD_LIMITS['isolated_timeout'],
+                    memory_limit_mb=GUARD_LIMITS['isolated_memory_mb'],
+                    name='integral_isolated'
+                )
+            except SolverWorkerError as e:
+                log_step(r"\text{The integral exceeded the resources available for large expressions}")
+                if e.reason == 'timeout':
+                    return "Error: The integral is too complex to solve within the time limit.", get_steps()
+                return "Error: The integral is too complex to solve within the memory limit.", get_steps()
+    
     result_container = [None]
     exception_container = [None]
     
@@ -626,11 +690,19 @@ def solve_integral(expr_str, var_str='x'):
             
             log_step(f"\\text{{Integrating: }} \\int {latex_format(expr)} \\, d{latex_format(var)}")
             
-            try:
-                expr = simplify(expr)
-                log_step(f"\\text{{Simplified to: }} {latex_format(expr)}")
-            except Exception:
-                pass
+            if pipeline == 'cheap':
+                log_step(r"\text{Large expression: skipping simplification and integrating directly}")
+                result = integrate(expr, var)
+                log_step(f"\\text{{Result: }} \\boxed{{{latex_format(result)} + C}}")
+                result_container[0] = (str(result), get_steps())
+                return
+            
+            if not presimplified:
+                try:
+                    expr = simplify(expr)
+                    log_step(f"\\text{{Simplified to: }} {latex_format(expr)}")
+                except Exception:
+                    pass
             
             if not is_elementary_integrable(expr, var):
                 log_step(r"\text{This integral does not have an elementary solution}")
@@ -657,12 +729,22 @@ def solve_integral(expr_str, var_str='x'):
         except Exception as e:
             exception_container[0] = e
     
-    solver_thread = threading.Thread(target=solve_with_timeout)
-    solver_thread.daemon = True
-    solver_thread.start()
-    solver_thread.join(timeout=60)
+    if nested:
+        solve_with_timeout()
+        solver_thread = None
+    else:
+        solver_thread = threading.Thread(target=solve_with_timeout)
+        solver_thread.daemon = True
+        solver_thread.start()
+        solver_thread.join(timeout=GUARD_LIMITS['cheap_budget'] if pipeline == 'cheap' else SOLVE_TIME_LIMIT)
+    
+    timed_out = (solver_thread is not None and solver_thread.is_alive()) or isinstance(exception_container[0], SolveTimeout)
+    
+    if timed_out and pipeline == 'cheap':
+        log_step(r"\text{Integration exceeded the time budget for large expressions}")
+        return "Error: The integral is too complex to solve within the time limit.", get_steps()
     
-    if solver_thread.is_alive():
+    if timed_out:
         log_step(r"\text{Integration exceeded time limit, using direct method}")
         try:
             expr, error = safe_parse_expr(expr_str) if not hasattr(expr_str, "is_Atom") else (expr_str, None)
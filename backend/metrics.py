@@ -0,0 +1,68 @@
+import os
+import threading
+
+_lock = threading.Lock()
+_counters = {}
+_observations = {}
+
+
+def _reinit_lock():
+    # A forked solver worker may inherit the lock while another thread holds it
+    global _lock
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_lock)
+
+
+def increment(name, amount=1):
+    """Add `amount` to the named counter"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name, value):
+    """Record one sample of a named measurement (count, total, max, last)"""
+    with _lock:
+        stats = _observations.get(name)
+        if stats is None:
+            stats = {'count': 0, 'total': 0.0, 'max': value, 'last': value}
+            _observations[name] = stats
+        stats['count'] += 1
+        stats['total'] += value
+        stats['max'] = max(stats['max'], value)
+        stats['last'] = value
+
+
+def snapshot():
+    """Return a copy of all counters and observations"""
+    with _lock:
+        observations = {}
+        for name, stats in _observations.items():
+            observations[name] = dict(stats)
+            observations[name]['mean'] = stats['total'] / stats['count'] if stats['count'] else 0.0
+        return {'counters': dict(_counters), 'observations': observations}
+
+
+def reset():
+    """Clear all recorded metrics"""
+    with _lock:
+        _counters.clear()
+        _observations.clear()
+
+
+def merge(other):
+    """Fold a snapshot taken in another process (e.g. a solver worker) into this one"""
+    with _lock:
+        for name, amount in other.get('counters', {}).items():
+            _counters[name] = _counters.get(name, 0) + amount
+        for name, incoming in other.get('observations', {}).items():
+            stats = _observations.get(name)
+            if stats is None:
+                _observations[name] = {k: incoming[k] for k in ('count', 'total', 'max', 'last')}
+                continue
+            stats['count'] += incoming['count']
+            stats['total'] += incoming['total']
+            stats['max'] = max(stats['max'], incoming['max'])
+            stats['last'] = incoming['last']
@@ -1,9 +1,13 @@
 import sympy as sp
+import numpy as np
 from sympy import diff, Symbol
 from sympy.parsing.sympy_parser import parse_expr
 import sys, os
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from backend.integral_solver import solve_integral
+from backend import integral_solver
+from backend.integral_solver import solve_integral, clear_steps, get_steps
+from backend.quadrature import gauss_legendre
 
 base_local_dict = {
     'sin': sp.sin, 'cos': sp.cos, 'tan': sp.tan,
@@ -17,7 +21,20 @@ base_local_dict = {
 
 s = "\\quad"
 
-steps_log = []
+# Seconds allowed for an exact symbolic definite integral before switching to
+# quadrature; SymPy settles the simple cases in tens of milliseconds, and the
+# quadrature answers in about one
+EXACT_BUDGET = float(os.environ.get('PARAMETRIC_EXACT_BUDGET') or 0.1)
+# Gauss-Legendre nodes per panel and starting panel count for the numeric fallback
+QUAD_NODES = 20
+QUAD_PANELS = 8
+
+DEFINITE_QUANTITIES = {
+    'area': r"\text{Signed area: } \int_a^b y(t) \, x'(t) \, dt",
+    'arc_length': r"\text{Arc length: } \int_a^b \sqrt{x'(t)^2 + y'(t)^2} \, dt",
+    'surface_x': r"\text{Surface area about the x-axis: } 2\pi \int_a^b |y(t)| \sqrt{x'(t)^2 + y'(t)^2} \, dt",
+    'surface_y': r"\text{Surface area about the y-axis: } 2\pi \int_a^b |x(t)| \sqrt{x'(t)^2 + y'(t)^2} \, dt",
+}
 
 def latex_format(expr):
     """Convert sympy expression to LaTeX format"""
@@ -43,25 +60,13 @@ def wrap_latex(step: str, block: bool = True) -> str:
         return "$ " + step + " $"
 
 def log_step(step, is_math=False, block_math=True):
-    """Add a step to the global steps log. If is_math True, wrap for LaTeX rendering."""
-    global steps_log
-    if is_math:
-        steps_log.append(wrap_latex(step, block=block_math))
-    else:
-        if any(tok in step for tok in ["\\int", "\\frac", "\\sqrt", "\\cdot", "_", "^", "\\("]):
-            steps_log.append(wrap_latex(step, block=block_math))
-        else:
-            steps_log.append(step)
-
-def clear_steps():
-    """Clear the global steps log"""
-    global steps_log
-    steps_log = []
-
-def get_steps():
-    """Get the current steps log"""
-    global steps_log
-    return steps_log.copy()
+    """
+    Add a step to the steps log shared with the integral engine, so its steps
+    follow ours without being copied. If is_math True, wrap for LaTeX rendering.
+    """
+    if is_math or any(tok in step for tok in ["\\int", "\\frac", "\\sqrt", "\\cdot", "_", "^", "\\("]):
+        step = wrap_latex(step, block=block_math)
+    integral_solver.steps_log.append(step)
 
 def ensure_symbol(var):
     """Ensure var is a Symbol object"""
@@ -72,9 +77,11 @@ def ensure_symbol(var):
 def solve_parametric(xt, yt, var):
     """
     Solve parametric curve integration: ∫ y dx = ∫ y(t) * x'(t) dt
-    Uses the main solve_integral function for detailed integration steps
+    Uses the main solve_integral function for detailed integration steps,
+    passing it the already simplified integrand
     """
     clear_steps()
+    integral_solver.start_deadline()
     
     var = ensure_symbol(var)
     local_dict = dict(base_local_dict)
@@ -100,26 +107,107 @@ def solve_parametric(xt, yt, var):
 
         log_step(f"\\text{{Simplify the integrand: }} {latex_format(expr_y)} \\cdot {latex_format(dx_dt)} = {latex_format(integrand)}"+s, is_math=True)
 
-        parametric_steps = get_steps().copy()
-        
-        integrand_str = str(integrand)
-        res = solve_integral(integrand_str, str(var))
-        
-        if isinstance(res, tuple) and len(res) == 2:
-            result_str, solver_steps = res
-        else:
-            result_str = str(res)
-            solver_steps = []
-
-        clear_steps()
-        for step in parametric_steps:
-            log_step(step)
-        for step in solver_steps:
-            log_step(step)
-
-        return result_str, get_steps()
+        # Hand the built expression straight to the integral engine so it is
+        # not printed, re-parsed and simplified a second time; it records into
+        # the same steps log and runs on this thread under the task's deadline
+        return solve_integral(integrand, var, presimplified=True, nested=True)
         
     except Exception as e:
         error_msg = f"Error: Unable to solve parametric integral. Details: {str(e)}"
         log_step(error_msg)
-        return error_msg, get_steps()
\ No newline at end of file
+        return error_msg, get_steps()
+
+
+def definite_integrand(quantity, expr_x, expr_y, var):
+    """Integrand in t for one of DEFINITE_QUANTITIES"""
+    dx_dt = diff(expr_x, var)
+    dy_dt = diff(expr_y, var)
+    speed = sp.sqrt(dx_dt**2 + dy_dt**2)
+    if quantity == 'area':
+        return expr_y * dx_dt
+    if quantity == 'arc_length':
+        return speed
+    if quantity == 'surface_x':
+        return 2 * sp.pi * sp.Abs(expr_y) * speed
+    if quantity == 'surface_y':
+        return 2 * sp.pi * sp.Abs(expr_x) * speed
+    raise ValueError(f"Unknown quantity '{quantity}'. Use: {', '.join(DEFINITE_QUANTITIES)}")
+
+
+def exact_definite(integrand, var, lower, upper, budget=EXACT_BUDGET):
+    """Closed-form value of the definite integral, or None if SymPy can't find one within budget"""
+    result = [None]
+
+    def attempt():
+        try:
+            value = sp.integrate(integrand, (var, lower, upper))
+            if not value.has(sp.Integral) and value.is_finite:
+                result[0] = sp.simplify(value)
+        except Exception:
+            pass
+
+    # Abandoned attempts end with the solver worker process
+    worker = threading.Thread(target=attempt, daemon=True)
+    worker.start()
+    worker.join(timeout=budget)
+    return None if worker.is_alive() else result[0]
+
+
+def composite_quadrature(f, lower, upper, panels=QUAD_PANELS, nodes=QUAD_NODES):
+    """Composite Gauss-Legendre quadrature of a vectorized f over [lower, upper]"""
+    edges = np.linspace(lower, upper, panels + 1)
+    values = gauss_legendre(f, edges[:-1], edges[1:], nodes)
+    if not np.all(np.isfinite(values)):
+        raise ValueError("The integrand is not finite on the interval")
+    return float(np.sum(values))
+
+
+def numeric_definite(integrand, var, lower, upper):
+    """Quadrature value and error estimate from comparing n and 2n panels"""
+    f = sp.lambdify(var, integrand, modules='numpy')
+    coarse = composite_quadrature(f, lower, upper)
+    fine = composite_quadrature(f, lower, upper, panels=2 * QUAD_PANELS)
+    return fine, abs(fine - coarse)
+
+
+def solve_parametric_definite(xt, yt, var, lower, upper, quantity='area'):
+    """
+    Definite parametric quantities over [lower, upper]: signed area, arc length
+    or surface area of revolution. Tries an exact symbolic value within
+    EXACT_BUDGET seconds, then falls back to vectorized Gauss-Legendre quadrature.
+    Returns (result_str, steps) like solve_parametric.
+    """
+    clear_steps()
+
+    var = ensure_symbol(var)
+    local_dict = dict(base_local_dict)
+    local_dict[str(var)] = var
+
+    try:
+        expr_x = parse_expr(xt, evaluate=False, local_dict=local_dict)
+        expr_y = parse_expr(yt, evaluate=False, local_dict=local_dict)
+        a = parse_expr(str(lower), local_dict=local_dict)
+        b = parse_expr(str(upper), local_dict=local_dict)
+        if not (a.is_real and b.is_real):
+            raise ValueError("The bounds must be real numbers")
+
+        integrand = definite_integrand(quantity, expr_x, expr_y, var)
+
+        log_step(DEFINITE_QUANTITIES[quantity] + s, is_math=True)
+        log_step(f"x({latex_format(var)}) = {latex_format(expr_x)}, \\quad y({latex_format(var)}) = {latex_format(expr_y)}"+s, is_math=True)
+        log_step(f"\\int_{{{latex_format(a)}}}^{{{latex_format(b)}}} {latex_format(integrand)} \\, d{latex_format(var)}"+s, is_math=True)
+
+        exact = exact_definite(integrand, var, a, b)
+        if exact is not None:
+            log_step(f"\\text{{Exact value: }} \\boxed{{{latex_format(exact)} \\approx {float(exact):.6f}}}", is_math=True)
+            return f"{exact} ≈ {float(exact):.6f}", get_steps()
+
+        log_step(r"\text{No closed form found quickly, using Gauss-Legendre quadrature}"+s, is_math=True)
+        value, error = numeric_definite(integrand, var, float(a), float(b))
+        log_step(f"\\text{{Numeric value: }} \\boxed{{{value:.6f}}} \\quad (\\text{{estimated error }} {error:.1e})", is_math=True)
+        return f"{value:.6f} (estimated error {error:.1e})", get_steps()
+
+    except Exception as e:
+        error_msg = f"Error: Unable to evaluate parametric integral. Details: {str(e)}"
+        log_step(error_msg)
+        return error_msg, get_steps()
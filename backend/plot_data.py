@@ -0,0 +1,227 @@
+import base64
+import os
+import logging
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from backend.expression_guard import analyze_expression, choose_pipeline
+from backend.polar_solver import safe_lambdify, evaluate_on_grid
+from backend.solution_table import parse_part
+from backend.solver_worker import run_isolated
+
+logger = logging.getLogger(__name__)
+
+PLOT_CACHE_SIZE = int(os.environ.get('PLOT_CACHE_SIZE') or 256)
+# Seconds a plot may take in its worker process
+PLOT_TIMEOUT = float(os.environ.get('PLOT_TIMEOUT') or 10.0)
+DEFAULT_PIXELS = 800
+MIN_PIXELS, MAX_PIXELS = 50, 4000
+# Adaptive sampling starts from INITIAL_SAMPLES parameter values and splits the
+# segments around any vertex that turns by more than MAX_TURN radians
+INITIAL_SAMPLES = 256
+MAX_SAMPLES = 16384
+MAX_TURN = 0.05
+REFINE_ROUNDS = 10
+# Points kept after decimation, per pixel of the requested width
+POINTS_PER_PIXEL = 4
+# Consecutive samples on opposite sides of the view's centre and more than
+# POLE_JUMP view heights apart straddle a pole, and are split by a gap instead
+# of joined by a line across the view
+POLE_JUMP = 2.0
+
+# Curve variable and default parameter range for each solver type
+PLOT_KINDS = {
+    'integral': ('x', -10.0, 10.0),
+    'parametric': ('t', 0.0, 2 * np.pi),
+    'polar': ('theta', 0.0, 2 * np.pi),
+}
+
+
+def parse_curve(kind, texts):
+    """
+    Parse the curve's expressions the way its solver does, without evaluating
+    them, rejecting unknown variables and anything the expression guard would
+    refuse to solve
+    """
+    if kind not in PLOT_KINDS:
+        raise ValueError(f"Unknown plot type: {kind}. Use: integral, parametric, or polar")
+    expected = 2 if kind == 'parametric' else 1
+    if len(texts) != expected:
+        raise ValueError(f"A {kind} plot needs {expected} expression{'s' if expected > 1 else ''}")
+
+    var = sp.Symbol(PLOT_KINDS[kind][0])
+    exprs = []
+    for text in texts:
+        expr = sp.sympify(parse_part(kind, text))
+        unknown = expr.free_symbols - {var}
+        if unknown:
+            raise ValueError(f"Unknown variables {unknown}. Use \"{var}\" as the variable.")
+        try:
+            pipeline = choose_pipeline(analyze_expression(expr, var))
+        except (TypeError, ValueError, OverflowError, RecursionError):
+            pipeline = 'reject'
+        if pipeline == 'reject':
+            raise ValueError("The expression is too large to plot. Please simplify it and try again.")
+        exprs.append(expr)
+    return tuple(exprs)
+
+
+def _points(kind, funcs, params):
+    """(x, y) of the curve at each parameter value, NaN where it is undefined"""
+    values = [evaluate_on_grid(func, params, default=np.nan) for func in funcs]
+    if kind == 'polar':
+        return values[0] * np.cos(params), values[0] * np.sin(params)
+    if kind == 'parametric':
+        return values[0], values[1]
+    return params.copy(), values[0]
+
+
+def sample_curve(kind, funcs, lower, upper):
+    """
+    Sample the curve densely where it bends. Each round splits the segments on
+    both sides of every vertex turning more than MAX_TURN, and every segment
+    where the curve starts or stops being defined. Returns (x, y, bounds) with
+    NaN gaps at poles and the view bounds of the evenly spaced first round,
+    which refining around a pole would otherwise stretch.
+    """
+    params = np.linspace(lower, upper, INITIAL_SAMPLES)
+    min_width = (upper - lower) * 1e-7
+    bounds = None
+    for _ in range(REFINE_ROUNDS):
+        x, y = _points(kind, funcs, params)
+        if bounds is None:
+            bounds = view_bounds(x, y)
+        with np.errstate(invalid='ignore'):
+            heading = np.arctan2(np.diff(y), np.diff(x))
+            turn = np.abs(np.angle(np.exp(1j * np.diff(heading))))
+            bends = turn > MAX_TURN
+        finite = np.isfinite(x) & np.isfinite(y)
+
+        split = finite[:-1] != finite[1:]
+        split[:-1] |= bends
+        split[1:] |= bends
+        split &= np.diff(params) > min_width
+        if not split.any() or params.size >= MAX_SAMPLES:
+            break
+        midpoints = 0.5 * (params[:-1] + params[1:])[split]
+        params = np.sort(np.concatenate((params, midpoints[:MAX_SAMPLES - params.size])))
+    x, y = _points(kind, funcs, params)
+    x, y = break_at_poles(x, y, bounds)
+    return x, y, bounds
+
+
+def _view_bounds(values):
+    """
+    [low, high] covering the values, but at most three 5-95 percentile spreads
+    beyond that range, so a curve running off to infinity (1/x) stays readable
+    """
+    low, high = np.percentile(values, [5, 95])
+    spread = high - low
+    return [float(max(values.min(), low - 3 * spread)), float(min(values.max(), high + 3 * spread))]
+
+
+def view_bounds(x, y):
+    """[xmin, xmax, ymin, ymax] of the defined points, from _view_bounds"""
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.any():
+        return [0.0, 0.0, 0.0, 0.0]
+    return _view_bounds(x[finite]) + _view_bounds(y[finite])
+
+
+def _jumps(values, low, high):
+    """True between consecutive values that jump across the view [low, high], as at a pole"""
+    centred = values - 0.5 * (low + high)
+    a, b = centred[:-1], centred[1:]
+    with np.errstate(invalid='ignore'):
+        return (np.sign(a) != np.sign(b)) & (np.abs(b - a) > POLE_JUMP * max(high - low, 1e-12))
+
+
+def break_at_poles(x, y, bounds):
+    """Insert a NaN point wherever the curve jumps across a pole between samples"""
+    breaks = np.nonzero(_jumps(x, *bounds[:2]) | _jumps(y, *bounds[2:]))[0] + 1
+    if not breaks.size:
+        return x, y
+    return np.insert(x, breaks, np.nan), np.insert(y, breaks, np.nan)
+
+
+def decimate(x, y, pixels, bounds=None):
+    """
+    Drop points that fall in the same pixel as the point before them, on a grid
+    `pixels` cells across the curve's bounding box, then thin evenly down to
+    POINTS_PER_PIXEL points per pixel. Runs of undefined points collapse into
+    one NaN gap marker. Returns (x, y, [xmin, xmax, ymin, ymax]), with the
+    given bounds or else those from view_bounds.
+    """
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.any():
+        return x[:0], y[:0], [0.0, 0.0, 0.0, 0.0]
+    if bounds is None:
+        bounds = view_bounds(x, y)
+    cell = max(bounds[1] - bounds[0], bounds[3] - bounds[2], 1e-12) / pixels
+    with np.errstate(invalid='ignore'):
+        cx = np.where(finite, np.floor((x - bounds[0]) / cell), -1)
+        cy = np.where(finite, np.floor((y - bounds[2]) / cell), -1)
+
+    keep = np.ones(x.size, dtype=bool)
+    keep[1:] = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+    keep[-1] = True
+    x = np.where(finite, x, np.nan)[keep]
+    y = np.where(finite, y, np.nan)[keep]
+
+    limit = POINTS_PER_PIXEL * pixels
+    if x.size > limit:
+        gaps = np.nonzero(np.isnan(x))[0]
+        idx = np.union1d(np.linspace(0, x.size - 1, limit).astype(int), gaps)
+        x, y = x[idx], y[idx]
+    return x, y, bounds
+
+
+def _plot(kind, exprs, lower, upper, pixels):
+    """Evaluate, sample and pack the curve; runs in a solver worker"""
+    var = sp.Symbol(PLOT_KINDS[kind][0])
+    funcs = [safe_lambdify(expr.doit(), var) for expr in exprs]
+    x, y, bounds = sample_curve(kind, funcs, lower, upper)
+    x, y, bounds = decimate(x, y, pixels, bounds)
+    packed = np.empty(2 * x.size, dtype='<f4')
+    packed[0::2] = x
+    packed[1::2] = y
+    return packed.tobytes(), bounds
+
+
+@lru_cache(maxsize=PLOT_CACHE_SIZE)
+def _cached_plot(kind, exprs, lower, upper, pixels):
+    """_plot in a worker process, cached here in the app process by the parsed input"""
+    return run_isolated(_plot, (kind, exprs, lower, upper, pixels), timeout=PLOT_TIMEOUT, name='plot')
+
+
+def plot_data(kind, texts, lower=None, upper=None, pixels=DEFAULT_PIXELS):
+    """
+    Plot points for a curve as (payload, info). payload is little-endian
+    float32 x, y pairs (NaN pairs mark gaps); info holds the point count,
+    bounds and parameter range. Results are cached per expression and range.
+    Raises SolverWorkerError if the curve takes too long or too much memory.
+    """
+    exprs = parse_curve(kind, texts)
+    _, default_lower, default_upper = PLOT_KINDS[kind]
+    lower = default_lower if lower is None else float(lower)
+    upper = default_upper if upper is None else float(upper)
+    if not (np.isfinite(lower) and np.isfinite(upper) and lower < upper):
+        raise ValueError("The plot range must satisfy lower < upper")
+    pixels = int(np.clip(int(pixels), MIN_PIXELS, MAX_PIXELS))
+
+    payload, bounds = _cached_plot(kind, exprs, lower, upper, pixels)
+    info = {
+        'solver_type': kind,
+        'count': len(payload) // 8,
+        'layout': 'xy',
+        'dtype': 'float32-le',
+        'bounds': bounds,
+        'range': [lower, upper],
+    }
+    return payload, info
+
+
+def encode_payload(payload):
+    return base64.b64encode(payload).decode('ascii')
@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+
+import numpy as np
+import sympy as sp
+
+from backend import metrics
+from backend import result_json
+from backend.expression_guard import inline_safe
+from backend.polar_solver import safe_lambdify, evaluate_on_grid, SOLVER_VERSION
+from backend.settings import data_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.environ.get('POLAR_CACHE_PATH') or data_path('polar_cache.db')
+MEMORY_SIZE = int(os.environ.get('POLAR_CACHE_SIZE') or 1024)
+# Points per period used to find the curves' phase, and the largest denominator
+# of a shift (as a multiple of π) that is normalized away
+PHASE_SAMPLES = 256
+MAX_SHIFT_DENOMINATOR = 48
+MAX_SHIFT_HARMONIC = 24
+
+_lock = threading.Lock()
+_memory = OrderedDict()
+
+
+def _is_periodic(func):
+    """True if a lambdified curve repeats after 2π"""
+    probe = np.linspace(0.0, 2 * np.pi, 64, endpoint=False) + 0.1234
+    return np.allclose(evaluate_on_grid(func, probe), evaluate_on_grid(func, probe + 2 * np.pi),
+                       rtol=1e-9, atol=1e-9)
+
+
+def _phase_shift(funcs):
+    """
+    Shift δ that brings the phase of the first significant harmonic of the
+    first non-constant curve to zero, and that harmonic's order k (0 if all
+    curves are constant). Shifting by δ + 2πj/k does the same for any j.
+    """
+    thetas = 2 * np.pi * np.arange(PHASE_SAMPLES) / PHASE_SAMPLES
+    for func in funcs:
+        coeffs = np.fft.rfft(evaluate_on_grid(func, thetas)) / PHASE_SAMPLES
+        scale = max(1.0, float(np.abs(coeffs).max()))
+        significant = np.nonzero(np.abs(coeffs[1:]) > 1e-8 * scale)[0]
+        if significant.size:
+            k = int(significant[0]) + 1
+            return -float(np.angle(coeffs[k])) / k, k
+    return 0.0, 0
+
+
+def _normalize_shift(inner, outer, theta_var):
+    """
+    Rotated copy of both curves whose key is the same for every rotation of the
+    pair, as (inner, outer, δ) with inner(θ) = original inner(θ + δ), or None
+    if the shift isn't a simple multiple of π
+    """
+    shift, k = _phase_shift([safe_lambdify(inner, theta_var), safe_lambdify(outer, theta_var)])
+    if k == 0:
+        return inner, outer, 0.0
+    if k > MAX_SHIFT_HARMONIC:
+        return None
+
+    candidates = []
+    for j in range(k):
+        delta = sp.nsimplify((shift + 2 * np.pi * j / k) / np.pi, tolerance=1e-9, rational=True)
+        if not delta.is_Rational or delta.q > MAX_SHIFT_DENOMINATOR:
+            return None
+        delta = sp.Mod(delta, 2) * sp.pi
+        rotated = (inner.subs(theta_var, theta_var + delta), outer.subs(theta_var, theta_var + delta))
+        candidates.append((str(rotated[0]), str(rotated[1]), float(delta), rotated))
+    # Every rotation of the pair has the same set of candidates, so pick the same one
+    _, _, delta, rotated = min(candidates, key=lambda c: (c[0], c[1]))
+    return rotated[0], rotated[1], delta
+
+
+def cache_key(inner, outer, theta_var, theta_start, theta_end, exact=False):
+    """
+    (key, δ) for a solve_polar call. Over a full period of two 2π-periodic
+    curves the area doesn't depend on where the range starts or on rotating
+    both curves together, so such pairs are keyed by their normalized rotation;
+    details stored under the key are in coordinates rotated by -δ. This runs
+    in the request process, so curves past the guard's inline limits raise
+    ValueError instead of being evaluated here.
+    """
+    inner, outer = sp.sympify(inner), sp.sympify(outer)
+    if not (inline_safe(inner, theta_var) and inline_safe(outer, theta_var)):
+        raise ValueError("Curves too large to key outside a solver worker")
+    inner, outer = inner.doit(), outer.doit()
+    shift = 0.0
+    full_period = abs(float(theta_end) - float(theta_start) - 2 * np.pi) < 1e-12
+    if (full_period and _is_periodic(safe_lambdify(inner, theta_var))
+            and _is_periodic(safe_lambdify(outer, theta_var))):
+        normalized = _normalize_shift(inner, outer, theta_var)
+        if normalized is not None:
+            inner, outer, shift = normalized
+            theta_start, theta_end = 0.0, 2 * np.pi
+    parts = [f"v{SOLVER_VERSION}", str(inner), str(outer), str(theta_var), f"{float(theta_start):.12g}", f"{float(theta_end):.12g}",
+             'exact' if exact else 'numeric']
+    return '|'.join(parts), shift
+
+
+def _rotate(details, angle):
+    """Copy of solve_polar details with every angle moved by `angle`"""
+    details = dict(details)
+    for key in ('theta_start', 'theta_end'):
+        if key in details:
+            details[key] += angle
+    if details.get('sectors'):
+        details['sectors'] = [dict(sector, start=sector['start'] + angle, end=sector['end'] + angle)
+                              for sector in details['sectors']]
+    return details
+
+
+def _connect():
+    conn = sqlite3.connect(CACHE_PATH, timeout=5)
+    conn.execute('CREATE TABLE IF NOT EXISTS polar_results (key TEXT PRIMARY KEY, result TEXT)')
+    return conn
+
+
+def _remember(key, result):
+    with _lock:
+        _memory[key] = result
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_SIZE:
+            _memory.popitem(last=False)
+
+
+def lookup(key):
+    """Stored (area, details) for a key, from memory or disk, or None"""
+    with _lock:
+        result = _memory.get(key)
+        if result is not None:
+            _memory.move_to_end(key)
+            metrics.increment('polar_cache.memory_hit')
+            return result
+
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute('SELECT result FROM polar_results WHERE key = ?', (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is not None:
+            result = result_json.loads(row[0])
+            _remember(key, result)
+            metrics.increment('polar_cache.disk_hit')
+            return result
+    except (sqlite3.Error, ValueError, TypeError) as e:
+        logger.warning(f"Polar cache unavailable: {e}")
+
+    metrics.increment('polar_cache.miss')
+    return None
+
+
+def store(key, result):
+    """Keep (area, details) in memory and on disk"""
+    _remember(key, result)
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO polar_results (key, result) VALUES (?, ?)',
+                             (key, result_json.dumps(result)))
+        finally:
+            conn.close()
+    except (sqlite3.Error, ValueError, TypeError) as e:
+        logger.warning(f"Could not store polar cache entry: {e}")
+
+
+def solve_cached(solve, inner, outer, theta_var, theta_start=0.0, theta_end=2 * np.pi,
+                 exact=False):
+    """
+    (area, details) of solve_polar for these arguments from the cache, or from
+    solve() (which must return them) and stored for next time. Results of a
+    solve that ran out of time are not stored.
+    """
+    try:
+        key, shift = cache_key(inner, outer, theta_var, theta_start, theta_end, exact)
+    except Exception as e:
+        logger.debug(f"Polar cache key failed, solving directly: {e}")
+        return solve()
+
+    cached = lookup(key)
+    if cached is not None:
+        area, details = cached
+        return area, _rotate(details, shift)
+
+    area, details = solve()
+    if not details.get('overruns'):
+        store(key, (area, _rotate(details, -shift)))
+    return area, details
@@ -1,9 +1,14 @@
 import numpy as np
 import sympy as sp
-from scipy.integrate import dblquad, quad
-from scipy.optimize import brentq
 import warnings
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from backend.quadrature import gauss_legendre
 
 warnings.filterwarnings('ignore')
 
@@ -11,17 +16,99 @@ logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+# Identifies the numeric method in cached results; bump it whenever a change can
+# alter solve_polar's areas or details so stale results stop being served
+SOLVER_VERSION = 1
+# Compiled numeric functions, reused by the stages of one solve that evaluate the
+# same curve; each solve runs in its own worker process, so none outlive it
+LAMBDIFY_CACHE_SIZE = int(os.environ.get('POLAR_LAMBDIFY_CACHE_SIZE') or 256)
+# Gauss-Legendre points per smooth sector, and the absolute error target over the whole range
+QUADRATURE_NODES = 32
+QUADRATURE_TOL = 1e-10
+# Seconds allowed for a closed-form area before reporting the numeric one only
+EXACT_BUDGET = float(os.environ.get('POLAR_EXACT_BUDGET') or 2.0)
+# Default wall-clock budget for one solve_polar call
+TIME_BUDGET = float(os.environ.get('POLAR_TIME_BUDGET') or 20.0)
+# Regions split into at least PARALLEL_SECTORS sectors are integrated on SECTOR_WORKERS threads
+PARALLEL_SECTORS = 8
+SECTOR_WORKERS = int(os.environ.get('POLAR_SECTOR_WORKERS') or 4)
+# Scan grids get SCAN_POINTS_PER_PERIOD points per oscillation of the fastest trig
+# term, and are refined SCAN_REFINE_FACTOR-fold wherever a root could hide between points
+SCAN_POINTS_PER_PERIOD = 16
+SCAN_MIN_SAMPLES = 64
+SCAN_MAX_SAMPLES = 20000
+SCAN_REFINE_LEVELS = 4
+SCAN_REFINE_FACTOR = 8
+
+# Set POLAR_MONTE_CARLO_CHECK=1 to verify sector areas against a random estimate
+MONTE_CARLO_CHECK = os.environ.get('POLAR_MONTE_CARLO_CHECK', '0') == '1'
+MONTE_CARLO_SAMPLES = int(os.environ.get('POLAR_MONTE_CARLO_SAMPLES') or 200000)
+
+
 class PolarIntegrationError(Exception):
     """Custom exception for polar integration errors"""
     pass
 
 
+class TimeBudget:
+    """
+    Wall-clock budget shared by the stages of one solve_polar call. Records
+    which stages overran and the accumulated quadrature error estimate.
+    """
+
+    def __init__(self, seconds):
+        self.deadline = time.monotonic() + seconds
+        self.overruns = []
+        self.error = 0.0
+
+    def remaining(self):
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def expired(self):
+        return time.monotonic() >= self.deadline
+
+    def overrun(self, stage):
+        if stage not in self.overruns:
+            logger.warning(f"Polar solve ran out of time during {stage}")
+            self.overruns.append(stage)
+
+    def run(self, stage, func, default, share=1.0):
+        """
+        func() if it finishes within `share` of the remaining time, else default.
+        An abandoned call keeps running in a daemon thread until the solver
+        worker process exits.
+        """
+        result = [default]
+
+        def target():
+            result[0] = func()
+
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        worker.join(timeout=self.remaining() * share)
+        if worker.is_alive():
+            self.overrun(stage)
+            return default
+        return result[0]
+
+
+@lru_cache(maxsize=LAMBDIFY_CACHE_SIZE)
+def _cached_lambdify(expr, var, modules):
+    return sp.lambdify(var, expr, modules)
+
+
 def safe_lambdify(expr, var, modules="numpy"):
     """
     Safely convert a SymPy expression to a numerical function with error handling.
+    Functions are cached by expression structure, variable and modules, so the
+    scan, decomposition and quadrature of one solve compile each curve once.
     """
     try:
-        return sp.lambdify(var, expr, modules)
+        try:
+            return _cached_lambdify(sp.sympify(expr), var, modules)
+        except TypeError:
+            # Unhashable modules (e.g. a list of dicts) can't be cached
+            return sp.lambdify(var, expr, modules)
     except Exception as e:
         logger.error(f"Failed to lambdify expression {expr}: {e}")
         raise PolarIntegrationError(f"Could not convert expression to numerical function: {e}")
@@ -42,57 +129,265 @@ def safe_evaluate(func, value, default=0.0):
         return default
 
 
+def evaluate_on_grid(func, thetas, default=0.0):
+    """
+    Evaluate a lambdified function on a whole array of angles at once.
+    NaN/Inf (and points where evaluation fails) are replaced by `default`,
+    matching safe_evaluate.
+    """
+    thetas = np.asarray(thetas, dtype=float)
+    try:
+        with np.errstate(all='ignore'):
+            values = np.asarray(func(thetas), dtype=float)
+        values = np.broadcast_to(values, thetas.shape).copy()
+    except Exception as e:
+        logger.debug(f"Vectorized evaluation failed, evaluating pointwise: {e}")
+        return np.array([safe_evaluate(func, t, default) for t in thetas], dtype=float)
+    values[~np.isfinite(values)] = default
+    return values
+
+
+def refine_roots(func, left, right, derivative=None, iterations=60):
+    """
+    Refine all brackets [left[i], right[i]] of a vectorized function together.
+    Each bracket must contain a sign change. With a derivative, Newton steps
+    are taken wherever they stay inside the bracket and bisection elsewhere;
+    without one, 60 halvings reach machine precision on any interval in [0, 4π].
+    """
+    left = np.array(left, dtype=float)
+    right = np.array(right, dtype=float)
+    if left.size == 0:
+        return left
+    f_left = func(left)
+    x = 0.5 * (left + right)
+    for _ in range(iterations):
+        f_x = func(x)
+        same_side = np.sign(f_x) == np.sign(f_left)
+        left = np.where(same_side, x, left)
+        f_left = np.where(same_side, f_x, f_left)
+        right = np.where(same_side, right, x)
+
+        x_next = 0.5 * (left + right)
+        if derivative is not None:
+            with np.errstate(all='ignore'):
+                newton = x - f_x / derivative(x)
+            inside = np.isfinite(newton) & (newton > left) & (newton < right)
+            x_next = np.where(inside, newton, x_next)
+        converged = np.all(np.abs(x_next - x) <= 1e-15 * (1.0 + np.abs(x)))
+        x = x_next
+        if converged:
+            break
+    return x
+
+
+def merge_roots(roots, tol=1e-8):
+    """Sort roots and collapse those closer than tol into one"""
+    roots = np.sort(np.asarray(roots, dtype=float))
+    if roots.size == 0:
+        return roots
+    keep = np.concatenate(([True], np.diff(roots) > tol))
+    return roots[keep]
+
+
+def sign_change_roots(func, thetas, derivative=None, zero_edges=False):
+    """
+    Roots of a vectorized function on the grid: strict sign changes refined
+    together, plus interior grid points where it is exactly zero. With
+    zero_edges, the ends of stretches where it is exactly zero (e.g. outside
+    the domain of sqrt(cos 2θ), where evaluate_on_grid returns 0) count too.
+    """
+    vals = func(thetas)
+    idx = np.nonzero(vals[:-1] * vals[1:] < 0)[0]
+    exact = thetas[1:-1][(vals[1:-1] == 0) & (vals[:-2] * vals[2:] < 0)]
+    if zero_edges:
+        # Runs of at least two zero points; a lone zero is a root or a tangency
+        pairs = (vals[:-1] == 0) & (vals[1:] == 0)
+        run = np.zeros(vals.shape, dtype=bool)
+        run[:-1] |= pairs
+        run[1:] |= pairs
+        idx = np.concatenate((idx, np.nonzero(run[:-1] != run[1:])[0]))
+    refined = refine_roots(func, thetas[idx], thetas[idx + 1], derivative)
+    return merge_roots(np.concatenate((refined, exact)))
+
+
+def _vectorized(expr, theta_var):
+    func = safe_lambdify(expr, theta_var)
+    return lambda t: evaluate_on_grid(func, t)
+
+
+def _derivative(expr, theta_var):
+    """Vectorized derivative of expr, or None if it can't be compiled"""
+    try:
+        derivative = sp.diff(expr, theta_var)
+        if derivative.has(sp.Derivative, sp.Subs):
+            return None
+        return _vectorized(derivative, theta_var)
+    except Exception:
+        return None
+
+
+def angular_frequency(exprs, theta_var, theta_start, theta_end):
+    """
+    Fastest rate at which the argument of any trig function in exprs turns,
+    per radian of θ, over [theta_start, theta_end]. 0 for curves without trig terms.
+    """
+    probe = np.linspace(float(theta_start), float(theta_end), 256)
+    frequency = 0.0
+    for expr in exprs:
+        for atom in sp.sympify(expr).atoms(sp.functions.elementary.trigonometric.TrigonometricFunction):
+            arg = atom.args[0]
+            if not arg.has(theta_var):
+                continue
+            try:
+                rate = sp.diff(arg, theta_var)
+                if rate.is_number:
+                    frequency = max(frequency, abs(float(rate)))
+                else:
+                    rates = evaluate_on_grid(safe_lambdify(rate, theta_var), probe)
+                    frequency = max(frequency, float(np.max(np.abs(rates))))
+            except Exception as e:
+                logger.debug(f"Could not estimate frequency of {atom}: {e}")
+    return frequency
+
+
+def scan_samples(exprs, theta_var, theta_start, theta_end):
+    """Number of evenly spaced points a scan of exprs over [theta_start, theta_end] starts with"""
+    span = abs(float(theta_end) - float(theta_start))
+    periods = span * angular_frequency(exprs, theta_var, theta_start, theta_end) / (2 * np.pi)
+    return int(np.clip(np.ceil(periods * SCAN_POINTS_PER_PERIOD), SCAN_MIN_SAMPLES, SCAN_MAX_SAMPLES))
+
+
+def scan_grid(funcs, theta_start, theta_end, samples):
+    """
+    Grid on which the sign changes of the vectorized funcs can be found.
+    Starts from `samples` even points. An interval [a, b] where |f(a)| + |f(b)|
+    is at most L·(b − a), with L twice the steepest slope seen on the grid,
+    could hide a pair of roots, so it is split SCAN_REFINE_FACTOR ways; this
+    repeats SCAN_REFINE_LEVELS times.
+    """
+    thetas = np.linspace(float(theta_start), float(theta_end), samples)
+    for func in funcs:
+        values = func(thetas)
+        slope = 2.0 * np.max(np.abs(np.diff(values)) / np.diff(thetas), initial=0.0)
+        grid = thetas
+        for _ in range(SCAN_REFINE_LEVELS):
+            widths = np.diff(grid)
+            # A zero end may be the edge of the domain, with a root just before it
+            suspect = ((values[:-1] * values[1:] >= 0) & ((values[:-1] != 0) | (values[1:] != 0))
+                       & (np.abs(values[:-1]) + np.abs(values[1:]) <= slope * widths))
+            if not suspect.any() or grid.size >= SCAN_MAX_SAMPLES:
+                break
+            steps = np.arange(1, SCAN_REFINE_FACTOR) / SCAN_REFINE_FACTOR
+            extra = (grid[:-1][suspect][:, None] + widths[suspect][:, None] * steps[None, :]).ravel()
+            grid = np.concatenate((grid, extra))
+            order = np.argsort(grid, kind='mergesort')
+            grid = grid[order]
+            values = np.concatenate((values, func(extra)))[order]
+        if grid.size > thetas.size:
+            thetas = np.union1d(thetas, grid)
+    return thetas
+
+
+def expr_scan_grid(exprs, theta_var, theta_start, theta_end):
+    """scan_grid for the sign changes of the sympy expressions exprs"""
+    exprs = [sp.sympify(expr) for expr in exprs]
+    samples = scan_samples(exprs, theta_var, theta_start, theta_end)
+    return scan_grid([_vectorized(expr, theta_var) for expr in exprs], theta_start, theta_end, samples)
+
+
+def _is_cheap_trig_polynomial(expr, theta_var, max_degree=2):
+    """
+    True if expr is a low-degree polynomial in sin/cos of rational multiples of θ,
+    the case where solveset reliably returns a finite set quickly.
+    """
+    trig = [atom for atom in expr.atoms(sp.sin, sp.cos) if atom.has(theta_var)]
+    if not trig or len(trig) > 2:
+        return False
+    for atom in trig:
+        coeff = sp.simplify(atom.args[0] / theta_var)
+        if not (coeff.is_Rational and coeff.q <= 4 and abs(coeff) <= 4):
+            return False
+    try:
+        poly = sp.Poly(expr, *trig)
+    except sp.PolynomialError:
+        return False
+    return not poly.free_symbols_in_domain and poly.total_degree() <= max_degree
+
+
+def symbolic_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end):
+    """
+    Exact angles where r_in² = r_out², or None unless the equation is a cheap
+    trig polynomial and solveset returns a finite set.
+    """
+    try:
+        equation = sp.expand(sp.sympify(inner_expr)**2 - sp.sympify(outer_expr)**2)
+        if not _is_cheap_trig_polynomial(equation, theta_var):
+            return None
+        sols = sp.solveset(equation, theta_var, domain=sp.Interval(theta_start, theta_end))
+        if not isinstance(sols, sp.FiniteSet) or not all(sol.is_real for sol in sols):
+            return None
+        return sorted(sols, key=float)
+    except Exception as e:
+        logger.debug(f"Symbolic intersection search skipped: {e}")
+        return None
+
+
+def find_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end,
+                       include_reflected=True, samples=None, budget=None):
+    """
+    All angles in [theta_start, theta_end] where the curves meet, as a sorted array.
+    The curves meet where r_in = r_out and, with include_reflected, also where
+    r_in = -r_out (the same point reached with a negative radius). Sign changes
+    of both differences are bracketed on one adaptive scan grid (or `samples`
+    even points) and refined together with Newton steps. Exact roots from cheap symbolic solving are merged in,
+    unless it overruns its share of `budget`.
+    """
+    inner_expr, outer_expr = sp.sympify(inner_expr), sp.sympify(outer_expr)
+    differences = [inner_expr - outer_expr]
+    if include_reflected:
+        differences.append(inner_expr + outer_expr)
+
+    if samples is None:
+        thetas = expr_scan_grid(differences, theta_var, theta_start, theta_end)
+    else:
+        thetas = np.linspace(float(theta_start), float(theta_end), samples)
+
+    roots = []
+    for difference in differences:
+        roots.append(sign_change_roots(_vectorized(difference, theta_var), thetas,
+                                       _derivative(difference, theta_var)))
+
+    if include_reflected:
+        solve = lambda: symbolic_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end)
+        exact = budget.run('symbolic intersections', solve, None, share=0.1) if budget else solve()
+        if exact:
+            roots.append(np.array([float(sol) for sol in exact]))
+
+    return merge_roots(np.concatenate(roots))
+
+
 def has_no_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end):
     """
     Check if two polar curves intersect in the given theta range.
     Returns True if NO intersections exist, False if intersections are found.
     """
     try:
-        f_in = safe_lambdify(inner_expr, theta_var)
-        f_out = safe_lambdify(outer_expr, theta_var)
-        
-        def difference(theta):
-            """Returns r_inner - r_outer at given theta"""
-            val_in = safe_evaluate(f_in, theta, 0.0)
-            val_out = safe_evaluate(f_out, theta, 0.0)
-            return val_in - val_out
+        difference_expr = sp.sympify(inner_expr) - sp.sympify(outer_expr)
+        difference = _vectorized(difference_expr, theta_var)
         
         try:
-            thetas = np.linspace(float(theta_start), float(theta_end), 2000)
+            thetas = expr_scan_grid([difference_expr], theta_var, theta_start, theta_end)
         except Exception as e:
             logger.error(f"Failed to create theta range: {e}")
             return True
         
-        diff_vals = np.array([difference(t) for t in thetas])
-        
-        if np.any(np.isnan(diff_vals)) or np.any(np.isinf(diff_vals)):
-            logger.warning("NaN or Inf values detected in difference calculation")
-            return True
+        diff_vals = difference(thetas)
         
         if np.all(diff_vals >= -1e-10) or np.all(diff_vals <= 1e-10):
             return True
         
-        sign_changes = np.where(np.diff(np.sign(diff_vals)))[0]
-        
-        if len(sign_changes) == 0:
-            return True
-        
-        for idx in sign_changes:
-            theta_left = thetas[idx]
-            theta_right = thetas[idx + 1]
-            
-            val_left = difference(theta_left)
-            val_right = difference(theta_right)
-            
-            if val_left * val_right < 0:
-                try:
-                    root = brentq(difference, theta_left, theta_right, xtol=1e-10)
-                    return False
-                except Exception as e:
-                    logger.debug(f"Root finding failed: {e}")
-                    return False
-        
-        return True
+        roots = sign_change_roots(difference, thetas, _derivative(difference_expr, theta_var))
+        return len(roots) == 0
         
     except PolarIntegrationError:
         raise
@@ -101,42 +396,43 @@ def has_no_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_e
         return True
 
 
+def find_pole_crossings(expr, theta_var, theta_start, theta_end):
+    """
+    All angles in [theta_start, theta_end] where r = expr changes sign, i.e.
+    where the curve passes through the pole, as a sorted array. The curve is
+    evaluated once on an adaptive scan grid and all brackets are refined together.
+    """
+    expr = sp.sympify(expr)
+    thetas = expr_scan_grid([expr], theta_var, theta_start, theta_end)
+    return sign_change_roots(_vectorized(expr, theta_var), thetas, _derivative(expr, theta_var))
+
+
 def adjust_integration_bounds(expr, theta_var, theta_start, theta_end):
     """
     Adjust integration bounds for curves that cross the pole (r=0).
-    For curves like r=cos(theta) that are only defined on one side,
-    integrate over the natural range to avoid double-counting.
+    A curve with r(θ + π) = -r(θ), like r = cos(θ) or r = cos(3θ), is traced
+    twice over [0, 2π], so it is integrated over one half-period starting at
+    its first pole crossing to avoid double-counting. Other curves keep the
+    full range, so every petal is counted once.
     """
     try:
         if abs(theta_start - 0) > 0.01 or abs(theta_end - 2*np.pi) > 0.01:
             return theta_start, theta_end
         
-        f = safe_lambdify(expr, theta_var)
+        expr = sp.sympify(expr)
         
         try:
-            thetas = np.linspace(0, 2*np.pi, 1000)
+            zero_crossings = find_pole_crossings(expr, theta_var, 0, 2*np.pi)
         except Exception as e:
-            logger.error(f"Failed to create theta range for bounds adjustment: {e}")
+            logger.error(f"Failed to find pole crossings for bounds adjustment: {e}")
             return theta_start, theta_end
         
-        vals = np.array([safe_evaluate(f, t, 0.0) for t in thetas])
-        
-        if np.any(np.isnan(vals)) or np.any(np.isinf(vals)):
-            logger.warning("Invalid values detected in bounds adjustment")
-            return theta_start, theta_end
-        
-        zero_crossings = []
-        for i in range(len(vals) - 1):
-            if vals[i] * vals[i+1] < 0:
-                try:
-                    crossing = brentq(lambda t: safe_evaluate(f, t, 0.0), thetas[i], thetas[i+1])
-                    zero_crossings.append(crossing)
-                except Exception as e:
-                    logger.debug(f"Root finding failed in bounds adjustment: {e}")
-                    zero_crossings.append(thetas[i])
-        
-        if len(zero_crossings) >= 2:
-            return zero_crossings[0], zero_crossings[1]
+        func = _vectorized(expr, theta_var)
+        probe = np.linspace(0, np.pi, 64, endpoint=False) + 0.1234
+        if np.allclose(func(probe + np.pi), -func(probe), rtol=1e-9, atol=1e-9):
+            # Such a curve meets the pole in every half-period; r = sin(θ) does so at 0 and π
+            start = zero_crossings[0] if len(zero_crossings) else theta_start
+            return start, start + np.pi
             
     except PolarIntegrationError:
         raise
@@ -146,17 +442,55 @@ def adjust_integration_bounds(expr, theta_var, theta_start, theta_end):
     return theta_start, theta_end
 
 
+def _polar_result(area, **details):
+    details.setdefault('symmetry_factor', 1)
+    details.setdefault('sectors', [])
+    return area, details
+
+
 def solve_polar(inner_expr, outer_expr, theta_var,
-                theta_start=0.0, theta_end=2 * np.pi, method='auto'):
+                theta_start=0.0, theta_end=2 * np.pi,
+                exact=False, return_details=False, time_budget=None):
     """
     Area inside `inner_expr` and outside `outer_expr` in polar coords.
     Semantics: compute area of points that lie inside the region traced by
     r = inner_expr(θ) and not inside r = outer_expr(θ).
+    With exact, a closed form is also attempted within EXACT_BUDGET seconds
+    and kept if it agrees with the numeric area.
+    With return_details, returns (area, details) where details records the
+    symmetry factor, the reduced θ range that was integrated, its sectors
+    (bounds, which curve is outer, area) and the exact area (or None).
+    All stages share `time_budget` seconds (default TIME_BUDGET). A stage that
+    runs out of time falls back to a cheaper method; details then lists the
+    overrun stages and the area's error estimate.
     
     Raises:
         PolarIntegrationError: If integration fails
         ValueError: If input parameters are invalid
     """
+    budget = TimeBudget(TIME_BUDGET if time_budget is None else time_budget)
+    area, details = _solve_polar_numeric(inner_expr, outer_expr, theta_var,
+                                         theta_start, theta_end, budget)
+    if exact:
+        start = details.get('theta_start', theta_start)
+        end = details.get('theta_end', theta_end)
+        value = exact_polar_area(inner_expr, outer_expr, theta_var, start, end,
+                                 budget=min(EXACT_BUDGET, budget.remaining()))
+        if value is not None:
+            value = sp.simplify(value * details['symmetry_factor'])
+            if value.is_number and abs(float(value) - area) <= 1e-7 * max(1.0, abs(area)):
+                details['exact'] = value
+            else:
+                logger.warning(f"Exact polar area {value} disagrees with numeric {area}, discarding")
+        details.setdefault('exact', None)
+    details['overruns'] = budget.overruns
+    details['error_estimate'] = budget.error * details['symmetry_factor']
+    return (area, details) if return_details else area
+
+
+def _solve_polar_numeric(inner_expr, outer_expr, theta_var,
+                         theta_start, theta_end, budget):
+    """Numeric area and details for solve_polar, staged under `budget`"""
     try:
         if not isinstance(theta_start, (int, float)) or not isinstance(theta_end, (int, float)):
             raise ValueError("theta_start and theta_end must be numeric values")
@@ -165,33 +499,16 @@ def solve_polar(inner_expr, outer_expr, theta_var,
             if not (theta_start >= 0 and theta_end == 0):
                 raise ValueError(f"theta_start ({theta_start}) must be less than theta_end ({theta_end})")
         
-        if method not in ['auto', 'cartesian', 'polar']:
-            raise ValueError(f"method must be 'auto', 'cartesian', or 'polar', got '{method}'")
-        
         if has_no_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end):
             try:
-                f_in = safe_lambdify(inner_expr, theta_var)
-                f_out = safe_lambdify(outer_expr, theta_var)
-                
                 adj_start_in, adj_end_in = adjust_integration_bounds(inner_expr, theta_var, theta_start, theta_end)
                 adj_start_out, adj_end_out = adjust_integration_bounds(outer_expr, theta_var, theta_start, theta_end)
                 
-                area_inner, err_in = quad(
-                    lambda t: 0.5 * safe_evaluate(f_in, t, 0.0)**2, 
-                    adj_start_in, adj_end_in,
-                    epsabs=1e-8, epsrel=1e-8
-                )
-                area_outer, err_out = quad(
-                    lambda t: 0.5 * safe_evaluate(f_out, t, 0.0)**2, 
-                    adj_start_out, adj_end_out,
-                    epsabs=1e-8, epsrel=1e-8
-                )
-                
-                if err_in > 1e-6 or err_out > 1e-6:
-                    logger.warning(f"High integration error: inner={err_in}, outer={err_out}")
+                area_inner = _compute_single_area(inner_expr, theta_var, adj_start_in, adj_end_in, budget)
+                area_outer = _compute_single_area(outer_expr, theta_var, adj_start_out, adj_end_out, budget)
                 
                 res = area_inner - area_outer
-                return max(res, 0)
+                return _polar_result(max(res, 0), method='no intersections')
                 
             except Exception as e:
                 logger.error(f"Error in no-intersection case: {e}")
@@ -206,59 +523,58 @@ def solve_polar(inner_expr, outer_expr, theta_var,
             raise ValueError(f"Could not convert expressions to SymPy format: {e}")
 
         try:
-            diff_eq = sp.Eq(sp.simplify(inner_expr**2 - outer_expr**2), 0)
-            sols = sp.solveset(diff_eq, theta_var,
-                               domain=sp.Interval(theta_start, theta_end))
+            intersections = find_intersections(inner_expr, outer_expr, theta_var, theta_start, theta_end,
+                                               budget=budget)
 
-            if getattr(sols, "is_empty", False) or sols == sp.EmptySet:
+            if len(intersections) == 0:
                 f_in = safe_lambdify(inner_expr, theta_var)
                 f_out = safe_lambdify(outer_expr, theta_var)
 
-                thetas = np.linspace(theta_start, theta_end, 2000)
-                inner_sq = np.array([safe_evaluate(f_in, t, 0.0)**2 for t in thetas])
-                outer_sq = np.array([safe_evaluate(f_out, t, 0.0)**2 for t in thetas])
+                thetas = expr_scan_grid([inner_expr**2 - outer_expr**2], theta_var, theta_start, theta_end)
+                inner_sq = evaluate_on_grid(f_in, thetas)**2
+                outer_sq = evaluate_on_grid(f_out, thetas)**2
 
                 if np.all(inner_sq >= outer_sq - 1e-8):
-                    A_inner = _compute_single_area(inner_expr, theta_var, theta_start, theta_end)
-                    A_outer = _compute_single_area(outer_expr, theta_var, theta_start, theta_end)
-                    return A_inner - A_outer
+                    A_inner = _compute_single_area(inner_expr, theta_var, theta_start, theta_end, budget)
+                    A_outer = _compute_single_area(outer_expr, theta_var, theta_start, theta_end, budget)
+                    return _polar_result(A_inner - A_outer, method='no intersections')
                 else:
-                    return 0.0
+                    return _polar_result(0.0, method='no intersections')
         except Exception as e:
-            logger.warning(f"Symbolic intersection check failed, continuing with numerical methods: {e}")
+            logger.warning(f"Intersection search failed, continuing with numerical methods: {e}")
 
         try:
-            if sp.simplify(inner_expr - outer_expr) == 0:
-                return 0.0
+            identical = budget.run('equality check', lambda: sp.simplify(inner_expr - outer_expr) == 0,
+                                   False, share=0.1)
+            if identical:
+                return _polar_result(0.0, method='identical curves')
         except Exception as e:
             logger.debug(f"Could not check for trivial equality: {e}")
 
         if abs(theta_end - theta_start - 2 * np.pi) < 1e-10:
             theta_end = theta_start + 2 * np.pi - 1e-10
 
-        symmetry_factor, reduced_start, reduced_end = _detect_symmetry(
-            inner_expr, outer_expr, theta_var, theta_start, theta_end
+        symmetry_factor, reduced_start, reduced_end = budget.run(
+            'symmetry detection',
+            lambda: _detect_symmetry(inner_expr, outer_expr, theta_var, theta_start, theta_end),
+            (1, theta_start, theta_end), share=0.25
         )
 
-        if method == 'auto':
-            method = _choose_method(inner_expr, outer_expr)
-
+        sectors = []
         try:
-            if method == 'cartesian':
-                area = _cartesian_area(inner_expr, outer_expr, theta_var,
-                                       reduced_start, reduced_end)
-            else:
-                area = _polar_area(inner_expr, outer_expr, theta_var,
-                                   reduced_start, reduced_end)
+            area = _polar_area(inner_expr, outer_expr, theta_var,
+                               reduced_start, reduced_end, budget=budget, sectors=sectors)
             
             if np.isnan(area) or np.isinf(area):
                 raise PolarIntegrationError(f"Integration resulted in {area}")
             
-            return area * symmetry_factor
+            return _polar_result(area * symmetry_factor, method='sectors',
+                                 symmetry_factor=symmetry_factor, sectors=sectors,
+                                 theta_start=reduced_start, theta_end=reduced_end)
             
         except Exception as e:
-            logger.error(f"Integration method '{method}' failed: {e}")
-            raise PolarIntegrationError(f"Integration failed using {method} method: {e}")
+            logger.error(f"Sector integration failed: {e}")
+            raise PolarIntegrationError(f"Integration failed: {e}")
 
     except (PolarIntegrationError, ValueError):
         raise
@@ -267,148 +583,366 @@ def solve_polar(inner_expr, outer_expr, theta_var,
         raise PolarIntegrationError(f"Unexpected error during polar integration: {e}")
 
 
-def _detect_symmetry(expr1, expr2, theta_var, theta_start, theta_end):
-    """Detect symmetry in expressions (placeholder for now)"""
-    return 1, theta_start, theta_end
+def _candidate_fold(exprs, theta_var):
+    """
+    Number of rotations k such that both curves repeat every 2π/k, from their
+    symbolic periods. None if either curve is aperiodic or its period doesn't divide 2π.
+    """
+    fold = 0
+    for expr in exprs:
+        if not expr.has(theta_var):
+            continue
+        try:
+            period = sp.periodicity(expr, theta_var)
+        except Exception:
+            period = None
+        if period is None:
+            return None
+        k = sp.nsimplify(2 * sp.pi / period)
+        if not k.is_Integer or k < 1:
+            return None
+        fold = int(sp.igcd(fold, int(k)))
+    return fold or 1
+
+
+def _reflection_axes(exprs, theta_var, period):
+    """
+    Axes θ = c that the curves are mirror-symmetric about, found from the parity
+    of both expressions about 0 and π/2 plus a few axes inside one period.
+    """
+    axes = []
+    for c in (0, sp.pi / 2):
+        try:
+            if all(sp.simplify(expr.subs(theta_var, 2 * c - theta_var) - expr) == 0 for expr in exprs):
+                axes.append(float(c))
+        except Exception:
+            pass
+    axes.extend(period * j / 4 for j in range(4))
+    return axes
 
 
-def _choose_method(expr1, expr2):
-    """Choose integration method based on expression complexity"""
+def _detect_symmetry(expr1, expr2, theta_var, theta_start, theta_end, samples=512):
+    """
+    Find rotational and reflective symmetry of the region between two curves.
+    Returns (factor, reduced_start, reduced_end) such that the area over the
+    full range is factor times the area over the reduced range. Candidates come
+    from the periodicity and parity of both expressions and are only accepted
+    if the area integrand matches on a numeric grid. Partial ranges are left alone.
+    """
+    if abs(theta_end - theta_start - 2 * np.pi) > 1e-8:
+        return 1, theta_start, theta_end
+
     try:
-        ops1 = sp.count_ops(expr1)
-        ops2 = sp.count_ops(expr2)
-        return 'cartesian' if ops1 + ops2 > 15 else 'polar'
+        exprs = [sp.sympify(expr1), sp.sympify(expr2)]
+        inner_func = safe_lambdify(exprs[0], theta_var)
+        outer_func = safe_lambdify(exprs[1], theta_var)
     except Exception as e:
-        logger.warning(f"Could not count operations, defaulting to polar: {e}")
-        return 'polar'
+        logger.debug(f"Symmetry detection skipped: {e}")
+        return 1, theta_start, theta_end
 
+    def integrand(thetas):
+        r_in = radial_extent(inner_func, thetas)
+        r_out = radial_extent(outer_func, thetas)
+        return np.maximum(r_in**2 - r_out**2, 0.0)
 
-def _cartesian_area(inner_expr, outer_expr, theta_var,
-                    theta_start, theta_end):
-    """
-    Fallback Cartesian double integral over bounding circle.
-    Uses absolute magnitudes for radii comparisons.
-    """
-    try:
-        inner_func = safe_lambdify(inner_expr, theta_var)
-        outer_func = safe_lambdify(outer_expr, theta_var)
+    base = _candidate_fold(exprs, theta_var)
+    if base is None:
+        return 1, theta_start, theta_end
 
-        theta_samples = np.linspace(theta_start, theta_end, 1000)
-        all_inner = [abs(safe_evaluate(inner_func, t, 0.0)) for t in theta_samples]
-        all_outer = [abs(safe_evaluate(outer_func, t, 0.0)) for t in theta_samples]
-        
-        if not all_inner or not all_outer:
-            raise PolarIntegrationError("Could not sample curve values")
-        
-        max_radius = max(max(all_inner), max(all_outer)) * 1.1
-        
-        if max_radius <= 0 or np.isnan(max_radius) or np.isinf(max_radius):
-            logger.warning("Invalid max_radius, returning 0")
-            return 0.0
+    # Irregular offsets so the check can't alias with the curves' own period
+    probe = theta_start + 2 * np.pi * (np.arange(samples) + 0.5 * np.sqrt(2)) / samples
+    reference = integrand(probe)
+    tol = 1e-9 * (1.0 + np.max(np.abs(reference)))
 
-        def point_in_intersection(x, y):
-            try:
-                r = np.sqrt(x**2 + y**2)
-                if r < 1e-12:
-                    return 1.0
-                theta_point = np.arctan2(y, x)
-                if theta_point < 0:
-                    theta_point += 2 * np.pi
-
-                if theta_start <= theta_end:
-                    if not (theta_start <= theta_point <= theta_end):
-                        return 0.0
-                else:
-                    if not (theta_point >= theta_start or theta_point <= theta_end):
-                        return 0.0
+    def matches(values):
+        return np.max(np.abs(values - reference)) <= tol
 
-                inner_val = safe_evaluate(inner_func, theta_point, 0.0)
-                outer_val = safe_evaluate(outer_func, theta_point, 0.0)
-                
-                inside_inner = r <= abs(inner_val) + 1e-12 and abs(inner_val) > 1e-12
-                inside_outer = r <= abs(outer_val) + 1e-12 and abs(outer_val) > 1e-12
-                return 1.0 if (inside_inner and not inside_outer) else 0.0
-            except Exception:
-                return 0.0
+    if not matches(integrand(probe + 2 * np.pi)):
+        return 1, theta_start, theta_end
 
-        def integrand(r_coord, theta_coord):
-            try:
-                x = r_coord * np.cos(theta_coord)
-                y = r_coord * np.sin(theta_coord)
-                return r_coord * point_in_intersection(x, y)
-            except Exception:
-                return 0.0
-
-        area, error = dblquad(
-            integrand, 0, 2 * np.pi,
-            lambda t: 0, lambda t: max_radius,
-            epsabs=1e-8, epsrel=1e-8
-        )
-        
-        if error > 1e-6:
-            logger.warning(f"High integration error in Cartesian method: {error}")
-        
-        return max(area, 0.0)
-        
-    except Exception as e:
-        logger.error(f"Cartesian area calculation failed: {e}")
-        raise PolarIntegrationError(f"Cartesian integration failed: {e}")
+    # Negative radii fold the curve through the pole, which can double the fold
+    fold = 1
+    for k in sorted({2 * base, base}, reverse=True):
+        if k > 1 and matches(integrand(probe + 2 * np.pi / k)):
+            fold = k
+            break
+    period = 2 * np.pi / fold
 
+    for c in _reflection_axes(exprs, theta_var, period):
+        mirrored = integrand(2 * c - probe)
+        if matches(mirrored):
+            return 2 * fold, c, c + period / 2
 
-def _polar_area(inner_expr, outer_expr, theta_var,
-               theta_start, theta_end):
+    return fold, theta_start, theta_start + period
+
+
+def radial_extent(func, thetas):
     """
-    Robust polar integrator with proper handling of negative r values.
+    Farthest point of the curve r = func(θ) along each ray θ.
+    A negative r at θ - π lands on the ray θ, so both branches are considered.
     """
-    try:
-        inner_func = safe_lambdify(inner_expr, theta_var)
-        outer_func = safe_lambdify(outer_expr, theta_var)
+    forward = evaluate_on_grid(func, thetas)
+    backward = evaluate_on_grid(func, thetas - np.pi)
+    return np.maximum(np.maximum(forward, 0.0), np.maximum(-backward, 0.0))
 
-        tol = 1e-12
 
-        def radial_candidates(f, theta):
-            """Get non-negative radial distances where curve intersects ray"""
-            candidates = []
-            
-            v = safe_evaluate(f, theta, None)
-            if v is not None and v >= -tol:
-                candidates.append(max(0.0, v))
-            
-            v2 = safe_evaluate(f, theta - np.pi, None)
-            if v2 is not None and v2 < -tol:
-                candidates.append(abs(v2))
-            
-            return candidates
+def smooth_breakpoints(funcs, theta_start, theta_end, samples=SCAN_MIN_SAMPLES):
+    """
+    Split [theta_start, theta_end] where any of the vectorized `funcs` changes
+    sign or leaves a stretch where it is zero, scanning from `samples` even
+    points (see scan_samples). Between consecutive breakpoints the region's
+    radial extents are smooth.
+    """
+    thetas = scan_grid(funcs, theta_start, theta_end, samples)
+    points = [np.array([theta_start, theta_end])]
+    for func in funcs:
+        points.append(sign_change_roots(func, thetas, zero_edges=True))
+    points = np.unique(np.concatenate(points))
+    return points[(points >= theta_start) & (points <= theta_end)]
 
-        def integrand(theta):
-            try:
-                rin_list = radial_candidates(inner_func, theta)
-                rout_list = radial_candidates(outer_func, theta)
 
-                r_in = max(rin_list) if len(rin_list) > 0 else 0.0
-                r_out = max(rout_list) if len(rout_list) > 0 else 0.0
+def sector_quadrature(integrand, breakpoints, nodes=QUADRATURE_NODES, max_width=np.pi / 8,
+                      tol=QUADRATURE_TOL, max_depth=12, budget=None):
+    """
+    Integrate a vectorized integrand over the sectors between breakpoints.
+    Each sector (split to at most max_width) gets a Gauss-Legendre rule and is
+    compared against the same rule on its two halves. Sectors whose difference
+    exceeds their share of `tol` are halved and retried, so only the
+    non-smooth spots are refined. Once `budget` runs out, the remaining
+    sectors are accepted as they are. Returns (value, error_estimate).
+    """
+    edges = [breakpoints[0]]
+    for left, right in zip(breakpoints[:-1], breakpoints[1:]):
+        pieces = max(int(np.ceil((right - left) / max_width)), 1)
+        edges.extend(np.linspace(left, right, pieces + 1)[1:])
+    edges = np.asarray(edges, dtype=float)
+    left, right = edges[:-1], edges[1:]
+    span = max(edges[-1] - edges[0], 1e-300)
+
+    total = 0.0
+    error = 0.0
+    for depth in range(max_depth + 1):
+        if left.size == 0:
+            break
+        mid = 0.5 * (left + right)
+        whole = gauss_legendre(integrand, left, right, nodes)
+        halves = gauss_legendre(integrand, np.concatenate((left, mid)), np.concatenate((mid, right)), nodes)
+        refined = halves[:left.size] + halves[left.size:]
+        sector_error = np.abs(refined - whole)
+
+        done = sector_error <= tol * (right - left) / span
+        if depth == max_depth:
+            done[:] = True
+        elif budget is not None and budget.expired() and not done.all():
+            budget.overrun('numeric integration')
+            done[:] = True
+        total += float(np.sum(refined[done]))
+        error += float(np.sum(sector_error[done]))
+        left, right = np.concatenate((left[~done], mid[~done])), np.concatenate((mid[~done], right[~done]))
+
+    return total, error
+
+
+def _monte_carlo_area(inner_func, outer_func, theta_start, theta_end, max_radius,
+                      samples=MONTE_CARLO_SAMPLES, seed=0):
+    """Estimate the region's area and standard error from uniform samples of the sector"""
+    rng = np.random.default_rng(seed)
+    phi = rng.uniform(theta_start, theta_end, samples)
+    r = max_radius * np.sqrt(rng.uniform(0.0, 1.0, samples))
+    inside = (r <= radial_extent(inner_func, phi)) & (r > radial_extent(outer_func, phi))
+    sector_area = 0.5 * max_radius**2 * (theta_end - theta_start)
+    p = inside.mean()
+    return sector_area * p, sector_area * np.sqrt(p * (1 - p) / samples)
+
+
+def decompose_sectors(inner_func, outer_func, theta_start, theta_end, samples=SCAN_MIN_SAMPLES):
+    """
+    Split [theta_start, theta_end] at intersection points and pole crossings.
+    Each sector is tagged with the curve that is farther from the pole on it:
+    'inner' (the sector adds area), 'outer' (it adds none) or 'pole' (neither
+    curve leaves the pole).
+    """
+    breakpoints = smooth_breakpoints(_region_kinks(inner_func, outer_func), theta_start, theta_end, samples)
+    left, right = breakpoints[:-1], breakpoints[1:]
+    # Tag at an off-centre point so a symmetric tangency can't hide the answer
+    probe = left + 0.41421356 * (right - left)
+    r_in = radial_extent(inner_func, probe)
+    r_out = radial_extent(outer_func, probe)
+
+    sectors = []
+    for a, b, rin, rout in zip(left, right, r_in, r_out):
+        if b - a < 1e-12:
+            # Sliver left between two copies of the same root
+            continue
+        if max(rin, rout) <= 1e-14:
+            outer = 'pole'
+        else:
+            outer = 'inner' if rin > rout else 'outer'
+        sectors.append({'start': float(a), 'end': float(b), 'outer': outer})
+    return sectors
+
+
+def _sector_area(sector, integrand, budget=None):
+    """(area, error) of one sector"""
+    if sector['outer'] != 'inner':
+        return 0.0, 0.0
+    return sector_quadrature(integrand, np.array([sector['start'], sector['end']]), budget=budget)
+
+
+def _region_area(inner_expr, outer_expr, theta_var, theta_start, theta_end, budget=None, sectors=None):
+    """
+    (area, error) of the points inside the inner curve and outside the outer
+    one, from the curves' radial extents integrated sector by sector. Many
+    sectors are integrated in parallel. If `sectors` is a list, the per-sector
+    bounds, tags and areas are appended to it.
+    """
+    inner_expr, outer_expr = sp.sympify(inner_expr), sp.sympify(outer_expr)
+    inner_func = safe_lambdify(inner_expr, theta_var)
+    outer_func = safe_lambdify(outer_expr, theta_var)
+
+    def integrand(thetas):
+        r_in = radial_extent(inner_func, thetas)
+        r_out = radial_extent(outer_func, thetas)
+        return 0.5 * np.maximum(r_in**2 - r_out**2, 0.0)
+
+    samples = scan_samples((inner_expr, outer_expr), theta_var, theta_start, theta_end)
+    pieces = decompose_sectors(inner_func, outer_func, theta_start, theta_end, samples)
+
+    def integrate(sector):
+        return _sector_area(sector, integrand, budget)
+
+    if len(pieces) >= PARALLEL_SECTORS:
+        with ThreadPoolExecutor(max_workers=SECTOR_WORKERS) as executor:
+            results = list(executor.map(integrate, pieces))
+    else:
+        results = [integrate(sector) for sector in pieces]
+
+    area = sum(result[0] for result in results)
+    error = sum(result[1] for result in results)
+    if budget is not None:
+        budget.error += error
+    if sectors is not None:
+        for sector, (sector_area, _) in zip(pieces, results):
+            sectors.append(dict(sector, area=sector_area))
+    return area, error
+
+
+def _region_kinks(inner_func, outer_func):
+    """Functions whose sign changes are where the region's area integrand is not smooth"""
+    return [
+        lambda t: evaluate_on_grid(inner_func, t),
+        lambda t: evaluate_on_grid(inner_func, t - np.pi),
+        lambda t: evaluate_on_grid(outer_func, t),
+        lambda t: evaluate_on_grid(outer_func, t - np.pi),
+        lambda t: radial_extent(inner_func, t) - radial_extent(outer_func, t),
+    ]
+
+
+def _exact_angle(value, known):
+    """Exact form of a numeric angle: one of the known exact roots or a simple multiple of π"""
+    for candidate in known:
+        if abs(float(candidate) - value) < 1e-9:
+            return candidate
+    ratio = sp.nsimplify(value / np.pi, tolerance=1e-9, rational=True)
+    if ratio.q <= 96 and abs(float(ratio) * np.pi - value) < 1e-8:
+        return ratio * sp.pi
+    return None
+
+
+def _exact_extent_squared(expr, func, theta_var, theta):
+    """r² of the branch that forms the curve's radial extent at angle theta (None for the pole)"""
+    forward = float(evaluate_on_grid(func, np.array([theta]))[0])
+    backward = -float(evaluate_on_grid(func, np.array([theta - np.pi]))[0])
+    if max(forward, backward) <= 0:
+        return None
+    if forward >= backward:
+        return expr**2
+    return expr.subs(theta_var, theta_var - sp.pi)**2
+
+
+def exact_polar_area(inner_expr, outer_expr, theta_var, theta_start, theta_end, budget=None):
+    """
+    Closed-form area inside the inner curve and outside the outer one, or None.
+    Sector endpoints are the numeric breakpoints matched to exact roots (or
+    rational multiples of π); on each sector the curve branches forming the
+    region are picked at an interior point and ½(r_in² − r_out²) is integrated with
+    SymPy's trig-power rules. Gives up after `budget` seconds.
+    """
+    budget = EXACT_BUDGET if budget is None else budget
+
+    def attempt():
+        try:
+            inner, outer = sp.sympify(inner_expr), sp.sympify(outer_expr)
+            if inner.has(sp.Abs, sp.sign, sp.Piecewise) or outer.has(sp.Abs, sp.sign, sp.Piecewise):
+                # SymPy's definite integrals of these are unreliable
+                return
+            inner_func = safe_lambdify(inner, theta_var)
+            outer_func = safe_lambdify(outer, theta_var)
+
+            known = list(symbolic_intersections(inner, outer, theta_var, theta_start, theta_end) or [])
+            for expr in (inner, outer):
+                if _is_cheap_trig_polynomial(expr, theta_var):
+                    for shift in (0, sp.pi):
+                        zeros = sp.solveset(expr.subs(theta_var, theta_var - shift), theta_var,
+                                            domain=sp.Interval(theta_start, theta_end))
+                        if isinstance(zeros, sp.FiniteSet):
+                            known.extend(zeros)
+
+            samples = scan_samples((inner, outer), theta_var, theta_start, theta_end)
+            breakpoints = smooth_breakpoints(_region_kinks(inner_func, outer_func), theta_start, theta_end, samples)
+            edges = [_exact_angle(b, known) for b in breakpoints]
+            if any(edge is None for edge in edges):
+                return
+
+            total = sp.Integer(0)
+            for left, right, a, b in zip(edges[:-1], edges[1:], breakpoints[:-1], breakpoints[1:]):
+                # Off-centre so the sample point doesn't land on a symmetric pole crossing
+                mid = a + 0.41421356 * (b - a)
+                r_in_sq = _exact_extent_squared(inner, inner_func, theta_var, mid)
+                if r_in_sq is None:
+                    continue
+                r_out_sq = _exact_extent_squared(outer, outer_func, theta_var, mid)
+                if r_out_sq is None:
+                    r_out_sq = sp.Integer(0)
+                if float(r_in_sq.subs(theta_var, mid)) <= float(r_out_sq.subs(theta_var, mid)):
+                    continue
+                piece = sp.integrate(sp.expand(sp.Rational(1, 2) * (r_in_sq - r_out_sq)), (theta_var, left, right))
+                if piece.has(sp.Integral):
+                    return
+                total += piece
+            return sp.simplify(total)
+        except Exception as e:
+            logger.debug(f"Exact polar area failed: {e}")
 
-                if r_in > r_out + 1e-14:
-                    result = 0.5 * (r_in * r_in - r_out * r_out)
-                    if np.isnan(result) or np.isinf(result):
-                        return 0.0
-                    return result
-                else:
-                    return 0.0
-            except Exception:
-                return 0.0
+    return TimeBudget(budget).run('exact integration', attempt, None)
+
+
+def _polar_area(inner_expr, outer_expr, theta_var,
+               theta_start, theta_end, cross_check=MONTE_CARLO_CHECK, budget=None, sectors=None):
+    """
+    Area inside the inner curve and outside the outer one from the radial
+    extents of both curves along each ray, integrated sector by sector.
+    With cross_check, a vectorized Monte Carlo estimate is compared against it.
+    """
+    try:
+        area, error = _region_area(inner_expr, outer_expr, theta_var, theta_start, theta_end, budget, sectors)
 
-        area, error = quad(
-            integrand, theta_start, theta_end,
-            epsabs=1e-8, epsrel=1e-8, limit=400
-        )
-        
-        if error > 1e-6:
-            logger.warning(f"High integration error in polar method: {error}")
-        
         if np.isnan(area) or np.isinf(area):
             raise PolarIntegrationError(f"Integration resulted in {area}")
-        
+        if error > 1e-6:
+            logger.warning(f"High integration error in polar area: {error}")
+
+        if cross_check and not (budget is not None and budget.expired()):
+            inner_func = safe_lambdify(inner_expr, theta_var)
+            outer_func = safe_lambdify(outer_expr, theta_var)
+            thetas = expr_scan_grid((inner_expr, outer_expr), theta_var, theta_start, theta_end)
+            max_radius = max(radial_extent(inner_func, thetas).max(), radial_extent(outer_func, thetas).max())
+            if max_radius > 0:
+                estimate, std_err = _monte_carlo_area(inner_func, outer_func, theta_start, theta_end, max_radius)
+                if abs(estimate - area) > 4 * std_err + 1e-3:
+                    logger.warning(f"Monte Carlo cross-check disagrees: quadrature {area}, "
+                                   f"estimate {estimate} ± {std_err}")
+
         return max(area, 0.0)
         
     except Exception as e:
@@ -416,24 +950,21 @@ def _polar_area(inner_expr, outer_expr, theta_var,
         raise PolarIntegrationError(f"Polar integration failed: {e}")
 
 
-def _compute_single_area(expr, theta_var, theta_start, theta_end):
+def _compute_single_area(expr, theta_var, theta_start, theta_end, budget=None):
     """
     Simple area of a single polar curve over [theta_start, theta_end].
     """
     try:
         r_func = safe_lambdify(expr, theta_var)
 
-        def integrand(theta):
-            rv = safe_evaluate(r_func, theta, 0.0)
-            result = 0.5 * (rv * rv)
-            if np.isnan(result) or np.isinf(result):
-                return 0.0
-            return result
+        def integrand(thetas):
+            return 0.5 * evaluate_on_grid(r_func, thetas)**2
 
-        area, error = quad(
-            integrand, theta_start, theta_end, 
-            epsabs=1e-8, epsrel=1e-8, limit=400
-        )
+        samples = scan_samples([expr], theta_var, theta_start, theta_end)
+        breakpoints = smooth_breakpoints([lambda t: evaluate_on_grid(r_func, t)], theta_start, theta_end, samples)
+        area, error = sector_quadrature(integrand, breakpoints, budget=budget)
+        if budget is not None:
+            budget.error += error
         
         if error > 1e-6:
             logger.warning(f"High integration error in single area: {error}")
@@ -449,14 +980,14 @@ def _compute_single_area(expr, theta_var, theta_start, theta_end):
 
 
 def area_inside_outside(inner_expr, outer_expr, theta_var, 
-                       theta_start=0.0, theta_end=2*np.pi, method='auto'):
+                       theta_start=0.0, theta_end=2*np.pi):
     """
     Wrapper function for solve_polar with consistent API.
     
     Returns:
         float: The area value, or raises PolarIntegrationError
     """
-    return solve_polar(inner_expr, outer_expr, theta_var, theta_start, theta_end, method)
+    return solve_polar(inner_expr, outer_expr, theta_var, theta_start, theta_end)
 
 
 if __name__ == "__main__":
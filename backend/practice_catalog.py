@@ -0,0 +1,305 @@
+import os
+import json
+import math
+import time
+import random
+import sqlite3
+import threading
+import logging
+
+from backend import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.environ.get('PRACTICE_DB_PATH') or 'practice_integrals.db'
+# Practice problem table for each problem type
+TABLES = {
+    'integral': 'practice_problems',
+    'parametric': 'parametric_practice_problems',
+    'polar': 'polar_practice_problems',
+}
+# Seconds between checks of the database file for changes
+RELOAD_INTERVAL = float(os.environ.get('PRACTICE_CATALOG_RELOAD_INTERVAL') or 1.0)
+# Random draws sample() checks in one query before it lists the candidates the
+# user hasn't completed, SAMPLE_BATCH ids per query
+SAMPLE_DRAWS = 8
+SAMPLE_BATCH = 500
+
+_catalog = None
+_checked_at = 0.0
+_reload_lock = threading.Lock()
+
+
+def format_bound_for_display(bound):
+    """Helper function to format a single bound in terms of π"""
+    if bound == 0:
+        return "0"
+    
+    pi_multiple = bound / math.pi
+    tolerance = 1e-10
+    
+    if abs(pi_multiple - round(pi_multiple)) < tolerance:
+        multiple = int(round(pi_multiple))
+        if multiple == 1:
+            return "π"
+        elif multiple == -1:
+            return "-π"
+        else:
+            return f"{multiple}π"
+    
+    half_multiple = pi_multiple * 2
+    if abs(half_multiple - round(half_multiple)) < tolerance:
+        numerator = int(round(half_multiple))
+        if numerator == 1:
+            return "π/2"
+        elif numerator == -1:
+            return "-π/2"
+        else:
+            return f"{numerator}π/2"
+    
+    third_multiple = pi_multiple * 3
+    if abs(third_multiple - round(third_multiple)) < tolerance:
+        numerator = int(round(third_multiple))
+        if numerator == 1:
+            return "π/3"
+        elif numerator == -1:
+            return "-π/3"
+        else:
+            return f"{numerator}π/3"
+    
+    fourth_multiple = pi_multiple * 4
+    if abs(fourth_multiple - round(fourth_multiple)) < tolerance:
+        numerator = int(round(fourth_multiple))
+        if numerator == 1:
+            return "π/4"
+        elif numerator == -1:
+            return "-π/4"
+        else:
+            return f"{numerator}π/4"
+    
+    return f"{bound:.4f}"
+
+
+def _version():
+    """Modification times of the database and its WAL file, which together change on every write"""
+    versions = []
+    for path in (DB_PATH, DB_PATH + '-wal'):
+        try:
+            versions.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            versions.append(None)
+    return tuple(versions)
+
+
+def _prepare(kind, problem):
+    """Fill in the fields every response derives from the stored row"""
+    problem['steps'] = problem['steps'].split('\n') if problem.get('steps') else []
+    if kind == 'polar':
+        problem['lower_bound_display'] = format_bound_for_display(problem['lower_bound'])
+        problem['upper_bound_display'] = format_bound_for_display(problem['upper_bound'])
+    return problem
+
+
+class Catalog:
+    """
+    Every practice problem, read once and never modified, indexed by id,
+    difficulty and technique, with each problem's JSON serialized up front
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.problems = {}
+        self.fragments = {}
+        self.by_difficulty = {}
+        self.by_technique = {}
+        self.by_filter = {}
+        self.techniques = {}
+        for kind in TABLES:
+            problems = {problem['id']: _prepare(kind, problem) for problem in rows.get(kind, [])}
+            self.problems[kind] = problems
+            self.fragments[kind] = {pid: json.dumps(problem, sort_keys=True) for pid, problem in problems.items()}
+
+            # by_filter maps (difficulty, technique), either of which may be None
+            # for "any", to the matching ids
+            by_difficulty, by_technique, by_filter = {}, {}, {(None, None): []}
+            for pid in sorted(problems):
+                problem = problems[pid]
+                difficulty, technique = problem.get('difficulty'), problem.get('technique')
+                by_difficulty.setdefault(difficulty, []).append(pid)
+                if technique is not None:
+                    by_technique.setdefault(technique, []).append(pid)
+                for key in {(None, None), (difficulty, None), (None, technique), (difficulty, technique)}:
+                    by_filter.setdefault(key, []).append(pid)
+            self.by_difficulty[kind] = by_difficulty
+            self.by_technique[kind] = by_technique
+            self.by_filter[kind] = by_filter
+
+            techniques = []
+            for technique in sorted(by_technique):
+                difficulties = [problems[pid]['difficulty'] for pid in by_technique[technique]]
+                techniques.append({
+                    'name': technique,
+                    'problem_count': len(difficulties),
+                    'difficulty_range': f"{min(difficulties)}-{max(difficulties)}"
+                })
+            self.techniques[kind] = techniques
+
+    def problem(self, kind, problem_id):
+        """The problem with this id (as sent by a client, so possibly a string), or None"""
+        try:
+            return self.problems[kind].get(int(problem_id))
+        except (TypeError, ValueError):
+            return None
+
+    def fragment(self, kind, problem_id):
+        return self.fragments[kind][problem_id]
+
+    def select(self, kind, difficulty=None, technique=None):
+        """Ids of the problems matching the filters, in id order"""
+        return self.by_filter[kind].get((difficulty or None, technique or None), [])
+
+    def sample(self, kind, difficulty=None, technique=None, completed=None):
+        """
+        A uniformly random id among the matching problems, or None. If given,
+        completed(ids) returns the subset of ids to skip; it is asked about a
+        few random draws first, and only when all of them are completed about
+        the remaining candidates, in batches.
+        """
+        candidates = self.select(kind, difficulty, technique)
+        if not candidates:
+            return None
+        if completed is None:
+            return random.choice(candidates)
+
+        draws = random.sample(candidates, min(SAMPLE_DRAWS, len(candidates)))
+        done = completed(draws)
+        for pid in draws:
+            if pid not in done:
+                return pid
+
+        remaining = []
+        for start in range(0, len(candidates), SAMPLE_BATCH):
+            batch = candidates[start:start + SAMPLE_BATCH]
+            done = completed(batch)
+            remaining.extend(pid for pid in batch if pid not in done)
+        return random.choice(remaining) if remaining else None
+
+
+def _connect():
+    """
+    Read-only connection to the practice database. The file is switched to WAL
+    journaling first, so a reload never blocks the generators writing new
+    problems; the mode is stored in the file, but only a writable connection
+    can set it.
+    """
+    try:
+        conn = sqlite3.connect(f'file:{DB_PATH}?mode=rw', uri=True)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not enable WAL for {DB_PATH}: {e}")
+    return sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True)
+
+
+def _read_rows():
+    """
+    (rows, version): the rows of every practice table as dicts, all read from
+    one snapshot of the database, and the file version they were read at
+    """
+    conn = _connect()
+    try:
+        # A first read creates the WAL file if needed, so the version is taken
+        # after it; taking it before the snapshot means a write in between only
+        # costs one extra reload
+        conn.execute('SELECT 1 FROM sqlite_master LIMIT 1').fetchall()
+        version = _version()
+        rows = {}
+        conn.execute('BEGIN')
+        for kind, table in TABLES.items():
+            try:
+                cursor = conn.execute(f'SELECT * FROM {table} ORDER BY id')
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Practice table {table} unavailable: {e}")
+                rows[kind] = []
+                continue
+            columns = [column[0] for column in cursor.description]
+            rows[kind] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+    return rows, version
+
+
+def load():
+    """Read the practice database into a new catalog and make it the current one"""
+    global _catalog, _checked_at
+    try:
+        rows, version = _read_rows()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not load practice problems from {DB_PATH}: {e}")
+        rows, version = {}, _version()
+    catalog = Catalog(rows, version)
+    _catalog = catalog
+    _checked_at = time.monotonic()
+    metrics.increment('practice_catalog.loaded')
+    logger.info("Loaded practice catalog: " + ", ".join(
+        f"{len(catalog.problems[kind])} {kind}" for kind in TABLES))
+    return catalog
+
+
+def current():
+    """
+    The loaded catalog, reloaded first if the database has changed since. A
+    reload builds a whole new catalog and swaps it in, so readers see either
+    the old problems or the new ones; while one thread reloads, the others
+    keep serving the old catalog.
+    """
+    global _checked_at
+    catalog = _catalog
+    if catalog is None:
+        with _reload_lock:
+            return _catalog or load()
+
+    if time.monotonic() - _checked_at < RELOAD_INTERVAL:
+        return catalog
+    _checked_at = time.monotonic()
+    if _version() == catalog.version or not _reload_lock.acquire(blocking=False):
+        return catalog
+    try:
+        if _catalog.version != _version():
+            metrics.increment('practice_catalog.reloaded')
+            return load()
+        return _catalog
+    finally:
+        _reload_lock.release()
+
+
+def progress_by_problem(session, ProgressModel, user_id, problem_ids):
+    """The user's progress rows for these problems keyed by problem id, in one query"""
+    if not problem_ids:
+        return {}
+    rows = session.query(ProgressModel).filter(
+        ProgressModel.user_id == user_id, ProgressModel.problem_id.in_(problem_ids)
+    ).all()
+    return {p.problem_id: p for p in rows}
+
+
+def completed_problem_ids(session, ProgressModel, user_id, problem_ids):
+    """The ids among problem_ids that the user has completed, in one query"""
+    if not problem_ids:
+        return set()
+    rows = session.query(ProgressModel.problem_id).filter(
+        ProgressModel.user_id == user_id, ProgressModel.completed.is_(True),
+        ProgressModel.problem_id.in_(problem_ids)
+    )
+    return {problem_id for (problem_id,) in rows}
+
+
+def problem_json(fragment, progress=None):
+    """A problem's JSON object with the user's progress on it as user_progress"""
+    user_progress = {
+        'attempts': progress.attempts if progress else 0,
+        'completed': progress.completed if progress else False
+    }
+    return f'{fragment[:-1]}, "user_progress": {json.dumps(user_progress, sort_keys=True)}}}'
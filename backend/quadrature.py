@@ -0,0 +1,16 @@
+import numpy as np
+
+
+def gauss_legendre(integrand, left, right, nodes):
+    """
+    Gauss-Legendre value of a vectorized integrand on each interval
+    [left[i], right[i]], with every node evaluated in one call
+    """
+    x, w = np.polynomial.legendre.leggauss(nodes)
+    left, right = np.asarray(left, dtype=float), np.asarray(right, dtype=float)
+    half = (right - left) / 2
+    mid = (right + left) / 2
+    points = mid[:, None] + half[:, None] * x[None, :]
+    # A constant integrand comes back as a scalar
+    values = np.broadcast_to(np.asarray(integrand(points.ravel()), dtype=float), (points.size,))
+    return np.sum(values.reshape(points.shape) * w[None, :], axis=1) * half
@@ -0,0 +1,68 @@
+import json
+
+import numpy as np
+import sympy as sp
+
+# Marks an encoded SymPy expression inside a JSON object
+SYMPY_KEY = '__sympy__'
+
+
+def encode_expr(expr):
+    """SymPy expression as a nested [class name, *args] list"""
+    if expr.is_Symbol:
+        return ['Symbol', expr.name]
+    if expr.is_Integer:
+        return ['Integer', int(expr)]
+    if expr.is_Rational:
+        return ['Rational', int(expr.p), int(expr.q)]
+    if expr.is_Float:
+        return ['Float', str(expr)]
+    return [type(expr).__name__] + [encode_expr(arg) for arg in expr.args]
+
+
+def decode_expr(tree):
+    """
+    Rebuild an expression from encode_expr's output. Only SymPy classes are
+    ever instantiated, and nothing is parsed or evaluated as code, so this is
+    safe on data from a file another user could have written.
+    """
+    name, args = tree[0], tree[1:]
+    if name == 'Symbol':
+        return sp.Symbol(str(args[0]))
+    if name == 'Integer':
+        return sp.Integer(int(args[0]))
+    if name == 'Rational':
+        return sp.Rational(int(args[0]), int(args[1]))
+    if name == 'Float':
+        return sp.Float(str(args[0]))
+    if not args and isinstance(getattr(sp.S, name, None), sp.Basic):
+        return getattr(sp.S, name)
+    cls = getattr(sp, name, None)
+    if not (isinstance(cls, type) and issubclass(cls, sp.Basic)):
+        raise ValueError(f"Not a SymPy class: {name}")
+    return cls(*[decode_expr(arg) for arg in args])
+
+
+def _default(value):
+    if isinstance(value, sp.Basic):
+        return {SYMPY_KEY: encode_expr(value)}
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot encode {type(value).__name__} as JSON")
+
+
+def _object_hook(obj):
+    if len(obj) == 1 and SYMPY_KEY in obj:
+        return decode_expr(obj[SYMPY_KEY])
+    return obj
+
+
+def dumps(result, **kwargs):
+    """JSON text of a solver result; tuples come back as lists"""
+    return json.dumps(result, default=_default, **kwargs)
+
+
+def loads(text):
+    return json.loads(text, object_hook=_object_hook)
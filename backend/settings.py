@@ -0,0 +1,24 @@
+import os
+
+# Directory for the files the app writes at runtime (solution table, polar
+# cache, strategy stats, benchmark baseline); by default the Flask instance
+# folder next to app.py, which also holds the SQLite database
+DATA_DIR = os.environ.get('DATA_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+
+
+def env_number(name, default):
+    """The environment variable `name` converted to the type of `default`, or `default` if unset or malformed"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return type(default)(value)
+    except ValueError:
+        return default
+
+
+def data_path(filename):
+    """Path of filename inside DATA_DIR, which is created if missing"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from backend import metrics
+from backend import result_json
+from backend.solver_worker import run_solver_task, WORKER_LIMITS
+from backend.solution_table import canonical_key
+
+logger = logging.getLogger(__name__)
+
+# Lock and result files; the directory must belong to this user and be closed to others
+FLIGHT_DIR = os.environ.get('SINGLE_FLIGHT_DIR') or os.path.join(
+    tempfile.gettempdir(), f"calculus_single_flight_{os.getuid() if hasattr(os, 'getuid') else 0}")
+# How long a finished result stays available to requests from other workers
+RESULT_TTL = float(os.environ.get('SINGLE_FLIGHT_RESULT_TTL') or 15.0)
+LOCK_POLL_INTERVAL = 0.05
+# Lock and temp files older than this were left by a worker that died mid-solve
+ABANDONED_TTL = 2 * WORKER_LIMITS['timeout']
+
+_lock = threading.Lock()
+_in_flight = {}
+_last_sweep = [0.0]
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _private_dir():
+    """
+    Create FLIGHT_DIR with mode 0700, refusing to use it if it already exists
+    as anything but a directory only this user can reach
+    """
+    os.makedirs(FLIGHT_DIR, mode=0o700, exist_ok=True)
+    info = os.lstat(FLIGHT_DIR)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"{FLIGHT_DIR} is not a directory private to this user")
+
+
+def _paths(key):
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    base = os.path.join(FLIGHT_DIR, digest)
+    return f'{base}.lock', f'{base}.result'
+
+
+def _sweep():
+    """
+    Delete expired results and files abandoned by dead workers from FLIGHT_DIR,
+    at most once per RESULT_TTL in each process
+    """
+    now = time.time()
+    if now - _last_sweep[0] < RESULT_TTL:
+        return
+    _last_sweep[0] = now
+    try:
+        entries = os.scandir(FLIGHT_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.endswith('.result'):
+                ttl = RESULT_TTL
+            elif entry.name.endswith(('.lock', '.tmp')):
+                ttl = ABANDONED_TTL
+            else:
+                continue
+            try:
+                if now - entry.stat(follow_symlinks=False).st_mtime > ttl:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _read_result(result_path):
+    """Result another worker stored for this key, or None if missing or stale"""
+    try:
+        if time.time() - os.path.getmtime(result_path) > RESULT_TTL:
+            os.unlink(result_path)
+            return None
+        with open(result_path) as f:
+            return result_json.loads(f.read())
+    except (OSError, ValueError, TypeError, IndexError):
+        return None
+
+
+def _write_result(result_path, result):
+    try:
+        text = result_json.dumps(result)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=FLIGHT_DIR)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, result_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not share single-flight result: {e}")
+
+
+def _acquire(lock_file, wait):
+    """
+    Take the node-wide lock for a key, giving up after `wait` seconds.
+    Returns (locked, waited), where waited means another worker held it.
+    """
+    deadline = time.monotonic() + wait
+    waited = False
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True, waited
+        except BlockingIOError:
+            if time.monotonic() > deadline:
+                return False, waited
+            waited = True
+            time.sleep(LOCK_POLL_INTERVAL)
+
+
+def _run_across_workers(key, func):
+    """
+    Serialize identical solves across worker processes on this node with a lock
+    file per key. The first worker computes and stores the result; workers that
+    were waiting on the lock read it instead of solving again. The leader
+    removes the lock file when it is done (waiters already hold it open), and
+    results are removed once they expire.
+    """
+    if fcntl is None:
+        return func()
+    try:
+        _private_dir()
+        _sweep()
+        lock_path, result_path = _paths(key)
+        lock_file = open(lock_path, 'a')
+    except OSError as e:
+        logger.warning(f"Single-flight lock unavailable, solving locally: {e}")
+        return func()
+
+    locked = False
+    try:
+        locked, waited = _acquire(lock_file, WORKER_LIMITS['timeout'] + 5)
+        if waited:
+            # Another worker held the lock, so it has probably just finished this solve
+            shared = _read_result(result_path)
+            if shared is not None:
+                metrics.increment('single_flight.shared_across_workers')
+                return shared
+
+        result = func()
+        if locked:
+            _write_result(result_path, result)
+        return result
+    finally:
+        if locked:
+            try:
+                os.unlink(lock_path)
+            except OSError:
+                pass
+        lock_file.close()
+
+
+def do(key, func):
+    """
+    Return func(), sharing one computation between all concurrent calls with
+    the same key. Threads in this process wait on the leading call; other
+    processes coordinate through _run_across_workers. Errors are passed to the
+    threads that waited, but are never cached.
+    """
+    with _lock:
+        flight = _in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight()
+            _in_flight[key] = flight
+
+    if not leader:
+        metrics.increment('single_flight.shared_in_process')
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    metrics.increment('single_flight.leader')
+    try:
+        flight.result = _run_across_workers(key, func)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+        flight.done.set()
+
+
+def run_shared_solver_task(solver_type, key_parts, func, *args, name='task', variant='', **kwargs):
+    """
+    run_solver_task, deduplicated by the canonical form of the solver input.
+    `variant` separates different questions about the same input (e.g. arc
+    length vs. area). Inputs that can't be canonicalized, including any the
+    expression guard won't let canonical_key evaluate here, are solved on
+    their own.
+    """
+    try:
+        key = canonical_key(solver_type, *key_parts) + (f"|{variant}" if variant else '')
+    except Exception:
+        return run_solver_task(func, *args, name=name, **kwargs)
+    return do(key, lambda: run_solver_task(func, *args, name=name, **kwargs))
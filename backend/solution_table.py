@@ -0,0 +1,98 @@
+import os
+import threading
+import logging
+
+import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
+
+from backend import metrics
+from backend import result_json
+from backend.expression_guard import inline_safe
+from backend.integral_solver import safe_parse_expr
+from backend.parametric_solver import base_local_dict as parametric_local_dict
+from backend.settings import data_path
+
+logger = logging.getLogger(__name__)
+
+TABLE_PATH = os.environ.get('SOLUTION_TABLE_PATH') or data_path('solution_table.json')
+# Variable of each solver's input, for the expression guard
+VARIABLES = {'integral': 'x', 'parametric': 't', 'polar': 'theta'}
+
+_lock = threading.Lock()
+_cache = {'mtime': None, 'entries': {}}
+
+
+def parse_part(solver_type, text):
+    """Parse one input part the same way the corresponding solver does"""
+    if isinstance(text, sp.Basic):
+        return text
+    text = str(text).strip()
+    if solver_type == 'integral':
+        expr, error = safe_parse_expr(text)
+        if error:
+            raise ValueError(error)
+        return expr
+    if solver_type == 'parametric':
+        local_dict = dict(parametric_local_dict)
+        local_dict['t'] = sp.Symbol('t')
+        return parse_expr(text.replace('^', '**'), evaluate=False, local_dict=local_dict)
+    return sp.sympify(text.replace('θ', 'theta'), evaluate=False)
+
+
+def canonical_key(solver_type, *parts):
+    """
+    Key identifying a solver input independent of spacing, factor order and
+    unevaluated constants, e.g. "integral:10*x*exp(x**2)". This runs in the
+    request process, so parts the expression guard would isolate or reject
+    raise ValueError instead of being evaluated.
+    """
+    var = sp.Symbol(VARIABLES.get(solver_type, 'x'))
+    exprs = []
+    for part in parts:
+        expr = parse_part(solver_type, part)
+        if not inline_safe(expr, var):
+            raise ValueError("Input too large to canonicalize outside a solver worker")
+        exprs.append(str(expr.doit()))
+    return f"{solver_type}:" + ";".join(exprs)
+
+
+def load_table():
+    """Current {key: entry} table, re-read when the file changes"""
+    try:
+        mtime = os.path.getmtime(TABLE_PATH)
+    except OSError:
+        return {}
+
+    with _lock:
+        if _cache['mtime'] != mtime:
+            try:
+                with open(TABLE_PATH) as f:
+                    _cache['entries'] = result_json.loads(f.read()).get('entries', {})
+                _cache['mtime'] = mtime
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Could not load solution table: {e}")
+        return _cache['entries']
+
+
+def lookup(solver_type, *parts):
+    """Precomputed entry for this input, or None"""
+    entries = load_table()
+    if not entries:
+        return None
+    try:
+        key = canonical_key(solver_type, *parts)
+    except Exception:
+        return None
+
+    entry = entries.get(key)
+    metrics.increment('solution_table.hit' if entry else 'solution_table.miss')
+    return entry
+
+
+def write_table(entries, path=None):
+    """Atomically replace the table file"""
+    path = path or TABLE_PATH
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(result_json.dumps({'entries': entries}, indent=1, sort_keys=True))
+    os.replace(tmp_path, path)
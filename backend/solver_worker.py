@@ -0,0 +1,253 @@
+import multiprocessing
+import os
+import threading
+import time
+import logging
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from backend import metrics
+from backend.settings import env_number
+
+logger = logging.getLogger(__name__)
+
+
+WORKER_LIMITS = {
+    # Extra address space a task may map on top of what it inherits from the app
+    'memory_limit_mb': env_number('SOLVER_MEMORY_LIMIT_MB', 1024),
+    # Resident set size at which the parent kills the task (0 disables the watchdog)
+    'rss_limit_mb': env_number('SOLVER_RSS_LIMIT_MB', 1536),
+    'timeout': env_number('SOLVER_TASK_TIMEOUT', 90.0),
+    'poll_interval': env_number('SOLVER_WORKER_POLL_INTERVAL', 0.05),
+}
+
+# Set in worker processes so nested solves (e.g. the guard's isolated pipeline
+# inside a parametric task) run inline, under whichever of their own limits
+# are tighter than the task's
+IN_WORKER = False
+
+
+class SolverWorkerError(Exception):
+    """Raised when an isolated solve times out, runs out of memory or crashes"""
+
+    def __init__(self, message, reason='error'):
+        super().__init__(message)
+        self.reason = reason
+
+    def user_message(self):
+        if self.reason == 'timeout':
+            return "The problem is too complex to solve within the time limit. Try a simpler expression."
+        if self.reason == 'memory':
+            return "The problem needs more memory than the solver allows. Try a simpler expression."
+        return f"The solver failed unexpectedly: {self}"
+
+
+def _mp_context():
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _current_address_space():
+    """Virtual memory size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[0])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _read_rss_mb(pid):
+    """Current and peak resident set size of a process in MB, from /proc"""
+    rss = peak = 0.0
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) / 1024
+                elif line.startswith('VmHWM:'):
+                    peak = int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return rss, peak
+
+
+def _apply_memory_limit(memory_limit_mb):
+    """
+    Cap further address-space growth of the current process.
+    The cap is relative to what is already mapped, since a forked worker
+    inherits the whole interpreter (SymPy, NumPy, ...) from its parent.
+    """
+    if resource is None or not memory_limit_mb:
+        return
+    limit = _current_address_space() + int(memory_limit_mb) * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not apply memory limit: {e}")
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(conn, func, args, kwargs, memory_limit_mb):
+    global IN_WORKER
+    IN_WORKER = True
+    metrics.reset()
+    start_rss, _ = _read_rss_mb('self')
+    _apply_memory_limit(memory_limit_mb)
+
+    try:
+        try:
+            outcome = ('ok', func(*args, **kwargs))
+        except MemoryError:
+            outcome = ('memory', 'Memory limit exceeded')
+        except Exception as e:
+            outcome = ('raise', e)
+
+        usage = {'peak_rss_mb': _peak_rss_mb(), 'start_rss_mb': start_rss}
+        try:
+            conn.send(outcome + (usage, metrics.snapshot()))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}", usage, metrics.snapshot()))
+    finally:
+        conn.close()
+
+
+def _record_usage(name, usage, reason):
+    peak = usage.get('peak_rss_mb', 0.0)
+    metrics.increment(f'worker.{name}.{reason}')
+    metrics.observe(f'worker.{name}.peak_rss_mb', peak)
+    metrics.observe(f'worker.{name}.rss_growth_mb', max(peak - usage.get('start_rss_mb', 0.0), 0.0))
+    logger.info(f"Solver task '{name}' finished ({reason}), peak RSS {peak:.1f} MB")
+
+
+def _run_inline(func, args, kwargs, timeout, memory_limit_mb, name):
+    """
+    run_isolated from inside a worker: func runs on a thread of this process,
+    with the address-space cap lowered to memory_limit_mb for the call and
+    abandoned after timeout seconds. The abandoned thread ends with the worker.
+    """
+    previous = None
+    if resource is not None and memory_limit_mb:
+        previous = resource.getrlimit(resource.RLIMIT_AS)
+        limit = _current_address_space() + int(memory_limit_mb) * 1024 * 1024
+        if previous[0] == resource.RLIM_INFINITY or limit < previous[0]:
+            try:
+                resource.setrlimit(resource.RLIMIT_AS, (limit, previous[1]))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not apply memory limit: {e}")
+                previous = None
+        else:
+            previous = None
+
+    start_rss, _ = _read_rss_mb('self')
+    outcome = [('error', 'Solver task did not finish')]
+
+    def target():
+        try:
+            outcome[0] = ('ok', func(*args, **kwargs))
+        except MemoryError:
+            outcome[0] = ('memory', 'Memory limit exceeded')
+        except Exception as e:
+            outcome[0] = ('raise', e)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        status, payload = 'timeout', "Solver task exceeded its time limit"
+    else:
+        status, payload = outcome[0]
+        if previous is not None:
+            resource.setrlimit(resource.RLIMIT_AS, previous)
+
+    _record_usage(name, {'peak_rss_mb': _peak_rss_mb(), 'start_rss_mb': start_rss}, status)
+    if status == 'ok':
+        return payload
+    if status == 'raise':
+        raise payload
+    raise SolverWorkerError(payload, reason=status)
+
+
+def run_isolated(func, args=(), kwargs=None, timeout=None, memory_limit_mb=None,
+                 rss_limit_mb=None, name='task'):
+    """
+    Run func(*args, **kwargs) in a separate process with an address-space cap
+    and an RSS watchdog. Returns the function's result, re-raises exceptions
+    raised by it, or raises SolverWorkerError if the worker times out, runs
+    out of memory or dies.
+    """
+    if timeout is None:
+        timeout = WORKER_LIMITS['timeout']
+    if memory_limit_mb is None:
+        memory_limit_mb = WORKER_LIMITS['memory_limit_mb']
+    if rss_limit_mb is None:
+        rss_limit_mb = WORKER_LIMITS['rss_limit_mb']
+
+    if IN_WORKER:
+        if timeout >= WORKER_LIMITS['timeout'] and memory_limit_mb >= WORKER_LIMITS['memory_limit_mb']:
+            return func(*args, **(kwargs or {}))
+        return _run_inline(func, args, kwargs or {}, timeout, memory_limit_mb, name)
+
+    ctx = _mp_context()
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(
+        target=_worker_main,
+        args=(child_conn, func, args, kwargs or {}, memory_limit_mb),
+        daemon=True
+    )
+    start = time.monotonic()
+    process.start()
+    child_conn.close()
+
+    usage = {'peak_rss_mb': 0.0, 'start_rss_mb': 0.0}
+    try:
+        while not parent_conn.poll(WORKER_LIMITS['poll_interval']):
+            rss, peak = _read_rss_mb(process.pid)
+            usage['peak_rss_mb'] = max(usage['peak_rss_mb'], peak)
+            if rss_limit_mb and rss > rss_limit_mb:
+                _record_usage(name, usage, 'memory')
+                raise SolverWorkerError(f"Solver worker exceeded {rss_limit_mb} MB RSS", reason='memory')
+            if time.monotonic() - start > timeout:
+                _record_usage(name, usage, 'timeout')
+                raise SolverWorkerError("Solver worker exceeded its time limit", reason='timeout')
+            if not process.is_alive() and not parent_conn.poll():
+                break
+
+        try:
+            status, payload, usage, worker_metrics = parent_conn.recv()
+        except EOFError:
+            process.join(1)
+            _record_usage(name, usage, 'memory')
+            raise SolverWorkerError(
+                f"Solver worker exited unexpectedly (exit code {process.exitcode})",
+                reason='memory'
+            )
+    finally:
+        parent_conn.close()
+        if process.is_alive():
+            process.terminate()
+        process.join(1)
+
+    metrics.merge(worker_metrics)
+    metrics.observe(f'worker.{name}.seconds', time.monotonic() - start)
+    _record_usage(name, usage, status)
+
+    if status == 'ok':
+        return payload
+    if status == 'raise':
+        raise payload
+    raise SolverWorkerError(payload, reason=status)
+
+
+def run_solver_task(func, *args, name='task', **kwargs):
+    """Run one solver call under the configured per-task time and memory limits"""
+    return run_isolated(func, args, kwargs, name=name)
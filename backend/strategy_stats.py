@@ -0,0 +1,277 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import logging
+
+from sympy import fraction, simplify, Pow, exp, log
+from sympy.functions.elementary.trigonometric import TrigonometricFunction, InverseTrigonometricFunction
+from sympy.functions.elementary.hyperbolic import HyperbolicFunction
+
+from backend import metrics
+from backend.settings import data_path
+from backend.solver_worker import run_isolated
+
+logger = logging.getLogger(__name__)
+
+STATS_PATH = os.environ.get('STRATEGY_STATS_PATH') or data_path('strategy_stats.json')
+REFRESH_SECONDS = float(os.environ.get('STRATEGY_STATS_REFRESH_SECONDS') or 3600)
+HISTORY_LIMIT = int(os.environ.get('STRATEGY_STATS_HISTORY_LIMIT') or 5000)
+# Seconds a rebuild may spend simplifying history in its worker process
+REBUILD_TIMEOUT = float(os.environ.get('STRATEGY_STATS_REBUILD_TIMEOUT') or 300)
+# Below this many recorded solves for a signature the default order is used
+MIN_SAMPLES = int(os.environ.get('STRATEGY_STATS_MIN_SAMPLES') or 5)
+
+DEFAULT_ORDER = [
+    'special', 'basic', 'u_substitution', 'trig_substitution',
+    'partial_fractions', 'integration_by_parts'
+]
+
+# Rough relative cost of trying each strategy, used to break near-ties
+STRATEGY_COST = {
+    'basic': 1.0,
+    'special': 1.5,
+    'partial_fractions': 2.0,
+    'trig_substitution': 2.0,
+    'u_substitution': 4.0,
+    'integration_by_parts': 5.0,
+}
+
+# First line in a solve's steps that identifies the technique which produced the answer
+STEP_MARKERS = [
+    ('Identified special integral', 'special'),
+    ('Identified polynomial expression', 'basic'),
+    ('Identified basic function', 'basic'),
+    ('Identified u-substitution opportunity', 'u_substitution'),
+    ('Identified expression suitable for trigonometric substitution', 'trig_substitution'),
+    ('Using partial fraction decomposition', 'partial_fractions'),
+    ('Using integration by parts', 'integration_by_parts'),
+    ('Using direct integration', 'direct'),
+]
+
+_lock = threading.Lock()
+_cache = {'mtime': None, 'stats': {}}
+_last_refresh = [0.0]
+_rebuild_lock = threading.Lock()
+
+
+def _degree_name(degree):
+    return {0: 'constant', 1: 'linear', 2: 'quadratic'}.get(degree, 'higher-degree')
+
+
+def _factor_kind(factor, var):
+    """Short structural label for one multiplicative factor"""
+    if factor.is_polynomial(var):
+        return 'polynomial'
+    if isinstance(factor, Pow):
+        if factor.exp.is_Integer and factor.exp > 0:
+            return f'power of {_factor_kind(factor.base, var)}'
+        if factor.base.is_polynomial(var):
+            return 'root of polynomial' if not factor.exp.is_Integer else 'reciprocal polynomial'
+        return 'algebraic'
+
+    if isinstance(factor, InverseTrigonometricFunction):
+        kind = 'inverse trig'
+    elif isinstance(factor, TrigonometricFunction):
+        kind = 'trig'
+    elif isinstance(factor, HyperbolicFunction):
+        kind = 'hyperbolic'
+    elif factor.func == exp:
+        kind = 'exponential'
+    elif factor.func == log:
+        kind = 'logarithm'
+    else:
+        return 'other'
+
+    arg = factor.args[0]
+    if arg.is_polynomial(var) and arg.as_poly(var) is not None and arg.as_poly(var).degree() <= 1:
+        return kind
+    return f'{kind} of composite'
+
+
+def structural_signature(expr, var):
+    """
+    Describe the shape of an integrand, e.g. "product of polynomial and trig"
+    or "rational with quadratic denominator". Constant factors are ignored.
+    """
+    try:
+        if expr.is_polynomial(var):
+            return 'polynomial'
+
+        num, denom = fraction(expr)
+        if denom.has(var) and num.is_polynomial(var) and denom.is_polynomial(var):
+            return f'rational with {_degree_name(denom.as_poly(var).degree())} denominator'
+
+        if expr.is_Add:
+            return 'sum'
+
+        factors = expr.args if expr.is_Mul else (expr,)
+        kinds = sorted({_factor_kind(f, var) for f in factors if f.has(var)})
+        if len(kinds) == 1:
+            return kinds[0]
+        return 'product of ' + ' and '.join(kinds)
+    except Exception:
+        return 'other'
+
+
+def technique_from_steps(steps):
+    """Strategy name that produced a recorded answer, or None if it can't be told"""
+    if any('exceeded time limit' in str(step) for step in steps):
+        return None
+    for step in steps:
+        step = str(step)
+        if 'Breaking down sum' in step:
+            return None
+        for marker, strategy in STEP_MARKERS:
+            if marker in step:
+                return strategy
+    return None
+
+
+def load_strategy_stats():
+    """Current {signature: {strategy: wins}} table, re-read when the file changes"""
+    try:
+        mtime = os.path.getmtime(STATS_PATH)
+    except OSError:
+        return {}
+
+    with _lock:
+        if _cache['mtime'] != mtime:
+            try:
+                with open(STATS_PATH) as f:
+                    _cache['stats'] = json.load(f).get('signatures', {})
+                _cache['mtime'] = mtime
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load strategy stats: {e}")
+        return _cache['stats']
+
+
+def order_strategies(signature, default_order=DEFAULT_ORDER):
+    """
+    Order strategies by estimated success rate per unit cost for this signature.
+    Falls back to the default order until enough solves have been recorded.
+    """
+    wins = load_strategy_stats().get(signature)
+    if not wins:
+        return list(default_order)
+    total = sum(wins.values())
+    if total < MIN_SAMPLES:
+        return list(default_order)
+
+    def score(strategy):
+        success_rate = (wins.get(strategy, 0) + 1) / (total + len(default_order))
+        return success_rate / STRATEGY_COST.get(strategy, 1.0)
+
+    metrics.increment('strategy.reordered')
+    return sorted(default_order, key=score, reverse=True)
+
+
+def history_signature(input_str, var):
+    """
+    Signature solve_integral looked up for a recorded input: that of the
+    simplified integrand, as passed to the strategies. None for inputs the
+    strategies never see whole: unparseable, large (no simplify) or
+    non-elementary ones, and sums, which are solved term by term.
+    """
+    from backend.integral_solver import safe_parse_expr, is_elementary_integrable
+    from backend.expression_guard import analyze_expression, choose_pipeline
+
+    expr, error = safe_parse_expr(input_str)
+    if error or choose_pipeline(analyze_expression(expr, var)) != 'full':
+        return None
+    try:
+        expr = simplify(expr)
+    except Exception:
+        pass
+    if expr.is_Add or not is_elementary_integrable(expr, var):
+        return None
+    return structural_signature(expr, var)
+
+
+def _write_stats(signatures):
+    """Replace the stats file atomically; concurrent writers each use their own temp file"""
+    directory = os.path.dirname(os.path.abspath(STATS_PATH))
+    fd, tmp_path = tempfile.mkstemp(prefix='.strategy_stats.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'updated_at': time.time(), 'signatures': signatures}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, STATS_PATH)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def rebuild_strategy_stats(rows):
+    """
+    Recompute success counts from solve history and persist them.
+    `rows` is an iterable of (input, steps_json) pairs from SolvedProblem.
+    """
+    from backend.integral_solver import ensure_symbol
+
+    var = ensure_symbol('x')
+    signatures = {}
+    for input_str, steps_json in rows:
+        try:
+            steps = json.loads(steps_json) if steps_json else []
+        except ValueError:
+            continue
+        strategy = technique_from_steps(steps)
+        if strategy is None or strategy == 'direct':
+            continue
+        try:
+            signature = history_signature(input_str, var)
+        except Exception as e:
+            logger.debug(f"Skipping history entry {input_str!r}: {e}")
+            continue
+        if signature is None:
+            continue
+        counts = signatures.setdefault(signature, {})
+        counts[strategy] = counts.get(strategy, 0) + 1
+
+    _write_stats(signatures)
+    metrics.increment('strategy.rebuilds')
+    return signatures
+
+
+def _rebuild_in_background(rows):
+    try:
+        run_isolated(rebuild_strategy_stats, (rows,), timeout=REBUILD_TIMEOUT, name='strategy_stats')
+    except Exception as e:
+        logger.error(f"Failed to refresh strategy stats: {e}")
+    finally:
+        _rebuild_lock.release()
+
+
+def refresh_if_due(load_rows):
+    """
+    Start rebuilding the stats file from `load_rows()` if it is older than
+    REFRESH_SECONDS. Only loading the rows happens on the calling thread; the
+    rebuild simplifies every entry, so it runs in a solver worker under the
+    usual memory limit and REBUILD_TIMEOUT, watched from a background thread,
+    one at a time per process. Other processes pick the new file up by mtime.
+    """
+    now = time.time()
+    if now - _last_refresh[0] < REFRESH_SECONDS:
+        return False
+    try:
+        if now - os.path.getmtime(STATS_PATH) < REFRESH_SECONDS:
+            _last_refresh[0] = now
+            return False
+    except OSError:
+        pass
+
+    if not _rebuild_lock.acquire(blocking=False):
+        return False
+    _last_refresh[0] = now
+    try:
+        rows = list(load_rows())
+        threading.Thread(target=_rebuild_in_background, args=(rows,), daemon=True).start()
+        return True
+    except Exception as e:
+        _rebuild_lock.release()
+        logger.error(f"Failed to refresh strategy stats: {e}")
+        return False
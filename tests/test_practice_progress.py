@@ -0,0 +1,93 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import Boolean, Column, Integer, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+
+from backend.practice_catalog import Catalog, completed_problem_ids, progress_by_problem
+
+Base = declarative_base()
+
+
+class UserProgress(Base):
+    __tablename__ = 'user_progress'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    problem_id = Column(Integer, nullable=False)
+    completed = Column(Boolean, default=False)
+    attempts = Column(Integer, default=0)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(UserProgress(user_id=user_id, problem_id=problem_id, attempts=problem_id,
+                                     completed=problem_id < 30)
+                        for user_id in (1, 2) for problem_id in range(1, 41, 2))
+        session.commit()
+        yield session
+
+
+def count_queries(session, func):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return result, len(statements)
+
+
+@pytest.mark.parametrize('page_size', [1, 20])
+def test_one_query_per_page(session, page_size):
+    page_ids = list(range(1, page_size + 1))
+    progress, queries = count_queries(
+        session, lambda: progress_by_problem(session, UserProgress, 1, page_ids))
+
+    assert queries == 1
+    assert sorted(progress) == [pid for pid in page_ids if pid % 2]
+    assert all(p.user_id == 1 and p.attempts == pid for pid, p in progress.items())
+
+
+def test_empty_page_runs_no_query(session):
+    progress, queries = count_queries(
+        session, lambda: progress_by_problem(session, UserProgress, 1, []))
+
+    assert progress == {}
+    assert queries == 0
+
+
+def test_sample_queries_only_drawn_candidates(session):
+    catalog = Catalog({'integral': [{'id': pid, 'difficulty': 1, 'technique': 'ibp'} for pid in range(1, 2001)]})
+    asked = []
+
+    def completed(ids):
+        asked.append(len(ids))
+        return completed_problem_ids(session, UserProgress, 1, ids)
+
+    pid, queries = count_queries(session, lambda: catalog.sample('integral', 1, 'ibp', completed=completed))
+
+    assert pid is not None and not (pid < 30 and pid % 2)
+    assert queries == len(asked)
+    assert max(asked) <= 500
+
+
+def test_sample_falls_back_to_remaining_candidates(session):
+    # Every candidate but 31 is completed, so most samples miss it in the first draws
+    catalog = Catalog({'integral': [{'id': pid, 'difficulty': 1} for pid in range(1, 32, 2)]})
+    completed = lambda ids: completed_problem_ids(session, UserProgress, 1, ids)
+
+    picks = {catalog.sample('integral', completed=completed) for _ in range(50)}
+
+    assert picks == {31}
+    assert catalog.sample('integral', completed=lambda ids: set(ids)) is None
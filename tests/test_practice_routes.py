@@ -0,0 +1,77 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+for module in ('flask', 'flask_sqlalchemy', 'flask_cors', 'flask_mail', 'authlib.integrations.flask_client'):
+    pytest.importorskip(module)
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from sqlalchemy import event
+
+from app import User, UserProgress, app, db
+from backend import practice_catalog
+from backend.practice_catalog import Catalog
+
+
+@pytest.fixture
+def client(monkeypatch):
+    catalog = Catalog({'integral': [{'id': pid, 'difficulty': 1, 'technique': 'ibp', 'problem_text': f'x^{pid}'}
+                                    for pid in range(1, 2001)]})
+    monkeypatch.setattr(practice_catalog, 'current', lambda: catalog)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        user = User(first_name='Ada', last_name='Lovelace', email='ada@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(UserProgress(user_id=user.id, problem_id=problem_id, attempts=problem_id,
+                                        completed=problem_id < 30)
+                           for problem_id in range(1, 41, 2))
+        db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+
+def progress_queries(client, url):
+    """The response to url and the number of statements it ran against user_progress"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if 'user_progress' in statement:
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return response, len(statements)
+
+
+@pytest.mark.parametrize('per_page', [1, 20])
+def test_by_difficulty_runs_one_progress_query(client, per_page):
+    response, queries = progress_queries(client, f'/api/practice/by-difficulty/1?per_page={per_page}')
+
+    assert response.status_code == 200
+    problems = response.get_json()['problems']
+    assert len(problems) == per_page
+    assert queries == 1
+    assert all(p['user_progress']['attempts'] == (p['id'] if p['id'] % 2 else 0) for p in problems)
+
+
+def test_random_problem_checks_only_drawn_candidates(client):
+    response, queries = progress_queries(client, '/api/practice/random?difficulty=1&exclude_completed=true')
+
+    assert response.status_code == 200
+    problem = response.get_json()['problem']
+    assert not (problem['id'] < 30 and problem['id'] % 2)
+    # One completion check for the sampled draws, one for the picked problem's progress
+    assert queries == 2